@@ -7,6 +7,10 @@ from pathlib import Path
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Backend paths, resolved once per cold start rather than on every health check
+BACKEND_DIR = Path(__file__).parent.parent
+LOCAL_DATA_DIR = BACKEND_DIR / 'mcp_server' / 'data'
+
 def check_data_files() -> dict:
     """
     Check if required data files are accessible.
@@ -23,7 +27,7 @@ def check_data_files() -> dict:
         data_dir = Path(data_path)
     else:
         # Local development
-        data_dir = Path(__file__).parent.parent / 'mcp_server' / 'data'
+        data_dir = LOCAL_DATA_DIR
     
     conditions_file = data_dir / 'conditions.json'
     guidelines_file = data_dir / 'guidelines.json'
@@ -127,13 +131,13 @@ def handler(event, context):
     # Check MCP server availability
     try:
         import sys
-        backend_path = Path(__file__).parent.parent
-        sys.path.insert(0, str(backend_path))
+        if str(BACKEND_DIR) not in sys.path:
+            sys.path.insert(0, str(BACKEND_DIR))
         
         from mcp_server.server import parse_clinical_note
         health_status['mcp_server'] = {
             'available': True,
-            'module_path': str(backend_path / 'mcp_server')
+            'module_path': str(BACKEND_DIR / 'mcp_server')
         }
     except ImportError as e:
         logger.warning(f"MCP server module not available: {e}")
@@ -1,9 +1,10 @@
-import json
 import logging
 import os
 import sys
 from pathlib import Path
 
+import orjson
+
 # Add the mcp_server to Python path for imports
 backend_path = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_path))
@@ -25,6 +26,12 @@ except ImportError as e:
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+
+def _dump_body(payload) -> str:
+    """Serialize a response body; non-JSON values fall back to their string form."""
+    return orjson.dumps(payload, default=str).decode()
+
+
 async def process_clinical_note_async(clinical_note: str):
     """
     Process clinical note using MCP server tools asynchronously.
@@ -159,7 +166,7 @@ def handler(event, context):
     try:
         # Parse the request body
         if event.get('body'):
-            body = json.loads(event['body'])
+            body = orjson.loads(event['body'])
         else:
             body = event
         
@@ -173,7 +180,7 @@ def handler(event, context):
                     'Access-Control-Allow-Origin': '*',
                     'Access-Control-Allow-Headers': 'Content-Type, Authorization, x-api-key, X-Api-Key',
                 },
-                'body': json.dumps({
+                'body': _dump_body({
                     'error': 'Bad Request',
                     'message': 'clinical_note is required and cannot be empty'
                 })
@@ -207,12 +214,12 @@ def handler(event, context):
                 'Access-Control-Allow-Methods': 'POST, OPTIONS',
                 'Access-Control-Allow-Headers': 'Content-Type, Authorization, x-api-key, X-Api-Key',
             },
-            'body': json.dumps(response_data)
+            'body': _dump_body(response_data)
         }
         
         return response
         
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Invalid JSON in request body: {e}")
         return {
             'statusCode': 400,
@@ -221,7 +228,7 @@ def handler(event, context):
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Headers': 'Content-Type, Authorization, x-api-key, X-Api-Key',
             },
-            'body': json.dumps({
+            'body': _dump_body({
                 'error': 'Bad Request',
                 'message': 'Invalid JSON in request body'
             })
@@ -236,7 +243,7 @@ def handler(event, context):
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Headers': 'Content-Type, Authorization, x-api-key, X-Api-Key',
             },
-            'body': json.dumps({
+            'body': _dump_body({
                 'error': 'Internal server error',
                 'message': str(e)
             })
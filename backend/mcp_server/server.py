@@ -1,13 +1,20 @@
 #!/usr/bin/env python3
 
 import asyncio
-import json
 import logging
+import os
 import re
-from typing import Dict, Any, List
+from contextvars import ContextVar
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, List, Mapping, Optional, Tuple
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 from pathlib import Path
+import orjson
+from jsonschema import Draft202012Validator
+from .utils.text import normalize_text
+from .tools.treatment_planner import clear_data_cache as _clear_planner_data_cache
 from .utils.error_handler import (
     ErrorHandler, handle_errors, global_error_handler,
     check_data_availability, check_condition_exists, check_medication_exists,
@@ -28,20 +35,47 @@ DATA_DIR = Path(__file__).parent / "data"
 CONDITIONS_FILE = DATA_DIR / "conditions.json"
 GUIDELINES_FILE = DATA_DIR / "guidelines.json"
 
+# Allowed medication names, compiled once for the up-front name check
+MEDICATION_NAME_PATTERN = r"^[a-zA-Z0-9_\s\-]+$"
+_MEDICATION_NAME_RE = re.compile(MEDICATION_NAME_PATTERN)
+
+
+# Per-context in-memory data keyed by file path, used instead of reading disk
+_data_override_var: ContextVar[Optional[Dict[Path, Dict[str, Any]]]] = ContextVar("data_override", default=None)
+
 
 def load_json_data(file_path: Path) -> Dict[str, Any]:
+    """Load JSON data from file, cached until the file's mtime or size changes."""
+    overrides = _data_override_var.get()
+    if overrides is not None and file_path in overrides:
+        return overrides[file_path]
+    
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        # Let the uncached loader report the problem
+        return _read_json_file(file_path)
+    return _load_json_data_cached(file_path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=16)
+def _load_json_data_cached(file_path: Path, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Memoized JSON load keyed on the file's path and stat signature."""
+    return _read_json_file(file_path)
+
+
+def _read_json_file(file_path: Path) -> Dict[str, Any]:
     """Load JSON data from file with enhanced error handling."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if not isinstance(data, dict):
-                raise DataError(ErrorDetails(
-                    code=ErrorCode.DATA_FILE_CORRUPTED,
-                    message=f"Data file {file_path} does not contain valid JSON object",
-                    details={"file_path": str(file_path), "data_type": type(data).__name__},
-                    recoverable=False
-                ))
-            return data
+        data = orjson.loads(Path(file_path).read_bytes())
+        if not isinstance(data, dict):
+            raise DataError(ErrorDetails(
+                code=ErrorCode.DATA_FILE_CORRUPTED,
+                message=f"Data file {file_path} does not contain valid JSON object",
+                details={"file_path": str(file_path), "data_type": type(data).__name__},
+                recoverable=False
+            ))
+        return data
     except FileNotFoundError:
         raise DataError(ErrorDetails(
             code=ErrorCode.DATA_FILE_NOT_FOUND,
@@ -49,7 +83,7 @@ def load_json_data(file_path: Path) -> Dict[str, Any]:
             details={"file_path": str(file_path)},
             recoverable=False
         ))
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise DataError(ErrorDetails(
             code=ErrorCode.DATA_FILE_INVALID_JSON,
             message=f"Invalid JSON in {file_path}: {e}",
@@ -65,44 +99,97 @@ def load_json_data(file_path: Path) -> Dict[str, Any]:
         ))
 
 
+def _parse_clinical_note_sync(clinical_note: str) -> Dict[str, Any]:
+    """Parse clinical note and extract structured patient data."""
+    from .tools.parser import _parse_clinical_note_sync as comprehensive_parse
+    return comprehensive_parse(clinical_note)
+
+
 async def parse_clinical_note(clinical_note: str) -> Dict[str, Any]:
     """Parse clinical note and extract structured patient data."""
-    from .tools.parser import parse_clinical_note as comprehensive_parse
-    return await comprehensive_parse(clinical_note)
+    # Parsing is pure CPU work; run it off the event loop so other requests keep being served
+    return await asyncio.to_thread(_parse_clinical_note_sync, clinical_note)
 
 
-@handle_errors(global_error_handler)
-async def identify_condition(symptoms: List[str], assessment: str, patient_age: int = None) -> Dict[str, Any]:
-    """Identify medical condition from symptoms and assessment."""
-    # Input validation
-    if not symptoms and not assessment:
-        raise ValidationError(ErrorDetails(
-            code=ErrorCode.INSUFFICIENT_PATIENT_DATA,
-            message="Either symptoms or assessment must be provided",
-            details={"symptoms": symptoms, "assessment": assessment}
-        ))
+# Assessment keywords for each condition
+ASSESSMENT_KEYWORDS = {
+    'croup': ['croup', 'laryngotracheobronchitis', 'laryngotracheitis', 'viral croup'],
+    'acute_asthma': ['asthma', 'acute asthma', 'asthma exacerbation', 'bronchospasm', 'wheeze'],
+    'copd_exacerbation': ['copd', 'chronic obstructive', 'copd exacerbation', 'acute exacerbation of copd'],
+    'pneumonia': ['pneumonia', 'community-acquired pneumonia', 'cap', 'chest infection', 'lower respiratory tract infection'],
+    'pediatric_gastroenteritis': ['gastroenteritis', 'gastro', 'viral gastroenteritis', 'diarrhea and vomiting', 'stomach bug']
+}
+
+# All condition keywords in one scanner, one group per condition, so a single pass over
+# the assessment finds every matching condition; word boundaries avoid false positives
+# (e.g., "cap" in "capillary") and the lookahead lets matches overlap
+_ASSESSMENT_CONDITION_IDS = tuple(ASSESSMENT_KEYWORDS)
+_ASSESSMENT_SCANNER = re.compile(
+    r'(?=\b(?:' + '|'.join(
+        '(' + '|'.join(re.escape(keyword.lower()) for keyword in keywords) + ')'
+        for keywords in ASSESSMENT_KEYWORDS.values()
+    ) + r')\b)'
+)
+
+
+class _ConditionsKey:
+    """Hashable handle on a loaded conditions dict, compared by identity, for memo keys."""
     
-    if patient_age is not None and (patient_age < 0 or patient_age > 150):
-        raise ValidationError(ErrorDetails(
-            code=ErrorCode.INVALID_PATIENT_DATA,
-            message="Patient age must be between 0 and 150 years",
-            details={"provided_age": patient_age}
-        ))
+    __slots__ = ('conditions',)
     
-    # Load conditions data
-    conditions = load_json_data(CONDITIONS_FILE)
-    check_data_availability(conditions, "conditions")
+    def __init__(self, conditions: Dict[str, Any]):
+        # Holding the dict keeps its id from being reused while a memo entry refers to it
+        self.conditions = conditions
+    
+    def __hash__(self) -> int:
+        return id(self.conditions)
+    
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _ConditionsKey) and other.conditions is self.conditions
+
+
+def clear_data_cache() -> None:
+    """Drop cached data files and every tool result memoized against them."""
+    _load_json_data_cached.cache_clear()
+    _clear_planner_data_cache()
+    _identify_condition_impl.cache_clear()
+    _calculate_dose_impl.cache_clear()
+    _conditions_for_symptom.cache_clear()
+
+
+@lru_cache(maxsize=4096)
+def _conditions_for_symptom(conditions_key: _ConditionsKey, symptom_lower: str) -> FrozenSet[str]:
+    """Condition IDs whose primary symptoms contain the symptom; memoized per conditions data."""
+    # Substring match, so partial symptoms ("cough" in "barky cough") still count
+    return frozenset(
+        condition_id
+        for condition_id, condition_data in conditions_key.conditions.items()
+        if any(
+            symptom_lower in primary_symptom.lower()
+            for primary_symptom in condition_data.get('symptoms', {}).get('primary', [])
+        )
+    )
+
+
+@lru_cache(maxsize=1024, typed=True)
+def _identify_condition_impl(
+    conditions_key: _ConditionsKey, symptoms: Tuple[str, ...], assessment: str, patient_age: Optional[int]
+) -> Tuple[Mapping[str, Any], ...]:
+    """Score conditions against validated inputs; memoized per conditions data, so read-only."""
+    conditions = conditions_key.conditions
     
     # Assessment-based condition matching with fallback to symptoms
     matches = []
     
-    # Define assessment keywords for each condition
-    assessment_keywords = {
-        'croup': ['croup', 'laryngotracheobronchitis', 'laryngotracheitis', 'viral croup'],
-        'acute_asthma': ['asthma', 'acute asthma', 'asthma exacerbation', 'bronchospasm', 'wheeze'],
-        'copd_exacerbation': ['copd', 'chronic obstructive', 'copd exacerbation', 'acute exacerbation of copd'],
-        'pneumonia': ['pneumonia', 'community-acquired pneumonia', 'cap', 'chest infection', 'lower respiratory tract infection'],
-        'pediatric_gastroenteritis': ['gastroenteritis', 'gastro', 'viral gastroenteritis', 'diarrhea and vomiting', 'stomach bug']
+    # Lowercase the assessment once rather than per condition
+    assessment_lower = assessment.lower() if assessment else ''
+    # Conditions each symptom supports, looked up once per symptom rather than per condition
+    symptom_conditions = [_conditions_for_symptom(conditions_key, symptom.lower()) for symptom in symptoms]
+    
+    # Conditions named in the assessment, found in one scan rather than once per condition
+    assessment_conditions = {
+        _ASSESSMENT_CONDITION_IDS[match.lastindex - 1]
+        for match in _ASSESSMENT_SCANNER.finditer(assessment_lower)
     }
     
     for condition_id, condition_data in conditions.items():
@@ -111,24 +198,14 @@ async def identify_condition(symptoms: List[str], assessment: str, patient_age:
         assessment_match = False
         
         # Primary approach: Check assessment for diagnostic keywords (high weight)
-        if assessment:
-            assessment_lower = assessment.lower()
-            condition_keywords = assessment_keywords.get(condition_id, [])
-            
-            for keyword in condition_keywords:
-                # Use word boundaries to avoid false positives (e.g., "cap" in "capillary")
-                keyword_pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-                if re.search(keyword_pattern, assessment_lower):
-                    score += 10  # High weight for assessment matches
-                    assessment_match = True
-                    break
+        if condition_id in assessment_conditions:
+            score += 10  # High weight for assessment matches
+            assessment_match = True
         
         # Secondary approach: Check symptoms only if no strong assessment match
         if not assessment_match:
-            primary_symptoms = condition_data.get('symptoms', {}).get('primary', [])
-            
-            for symptom in symptoms:
-                if any(symptom.lower() in primary_symptom.lower() for primary_symptom in primary_symptoms):
+            for symptom, supported_conditions in zip(symptoms, symptom_conditions):
+                if condition_id in supported_conditions:
                     score += 2
                     matched_symptoms.append(symptom)
         
@@ -146,73 +223,45 @@ async def identify_condition(symptoms: List[str], assessment: str, patient_age:
                 score -= 3
         
         if score > 0:
-            matches.append({
+            matches.append(MappingProxyType({
                 'condition_id': condition_id,
                 'condition_name': condition_data.get('name', condition_id),
                 'confidence_score': score,
-                'matched_symptoms': matched_symptoms,
+                'matched_symptoms': tuple(matched_symptoms),
                 'assessment_match': assessment_match
-            })
+            }))
     
     # Sort by confidence score
     matches.sort(key=lambda x: x['confidence_score'], reverse=True)
     
-    return {
-        'success': True,
-        'matches': matches,
-        'top_match': matches[0] if matches else None,
-        'total_conditions_evaluated': len(conditions)
-    }
+    return tuple(matches)
 
 
-@handle_errors(global_error_handler)
-async def calculate_medication_dose(
-    medication: str, 
-    condition: str, 
-    patient_weight: float, 
-    severity: str = "moderate"
-) -> Dict[str, Any]:
-    """Calculate weight-based medication dose."""
-    # Input validation
-    if not medication or not condition:
-        raise ValidationError(ErrorDetails(
-            code=ErrorCode.INSUFFICIENT_PATIENT_DATA,
-            message="Medication and condition must be provided",
-            details={"medication": medication, "condition": condition}
-        ))
+@lru_cache(maxsize=1024, typed=True)
+def _calculate_dose_impl(
+    conditions_key: _ConditionsKey, medication: str, condition: str, patient_weight: float, severity: str
+) -> Mapping[str, Any]:
+    """Calculate a dose from validated inputs; memoized per conditions data, so read-only."""
+    conditions = conditions_key.conditions
     
-    if patient_weight < 0.5 or patient_weight > 300.0:
-        raise ValidationError(ErrorDetails(
-            code=ErrorCode.INVALID_PATIENT_DATA,
-            message="Patient weight must be between 0.5 and 300 kg",
-            details={"provided_weight": patient_weight}
-        ))
-    
-    # Load conditions data
-    conditions = load_json_data(CONDITIONS_FILE)
-    check_data_availability(conditions, "conditions")
-    
-    # Find condition
-    condition_data = None
-    condition_id = None
-    for cond_id, cond_data in conditions.items():
-        if cond_id == condition or cond_data.get('name', '').lower() == condition.lower():
-            condition_data = cond_data
-            condition_id = cond_id
-            break
+    # Find condition: direct ID lookup first, then fall back to matching by name
+    condition_data = conditions.get(condition)
+    condition_id = condition
+    if condition_data is None:
+        condition_lower = condition.lower()
+        for cond_id, cond_data in conditions.items():
+            if cond_data.get('name', '').lower() == condition_lower:
+                condition_data = cond_data
+                condition_id = cond_id
+                break
     
     if not condition_data:
         check_condition_exists(condition, conditions)
     
     # Find medication in condition
     medications = condition_data.get('medications', {})
-    check_medication_exists(medication, condition_id, medications)
-    
-    medication_data = None
-    for med_line in ['first_line', 'second_line']:
-        if med_line in medications and medication in medications[med_line]:
-            medication_data = medications[med_line][medication]
-            break
+    med_line = check_medication_exists(medication, condition_id, medications)
+    medication_data = medications[med_line][medication]
     
     # Calculate dose
     dose_per_kg = medication_data.get('dose_mg_per_kg', 0)
@@ -235,7 +284,7 @@ async def calculate_medication_dose(
     if final_dose != calculated_dose:
         logger.warning(f"Dose adjusted from {calculated_dose}mg to {final_dose}mg for {medication}")
     
-    return {
+    return MappingProxyType({
         "success": True,
         "medication": medication,
         "condition": condition,
@@ -250,13 +299,112 @@ async def calculate_medication_dose(
         "max_dose": max_dose,
         "min_dose": min_dose,
         "dosing_rationale": f"Calculated at {dose_per_kg} mg/kg for {patient_weight}kg patient",
-        "contraindications": medication_data.get('contraindications', []),
+        "contraindications": tuple(medication_data.get('contraindications', [])),
         "clinical_notes": medication_data.get('clinical_notes', '')
+    })
+
+
+@handle_errors(global_error_handler)
+def _identify_condition_sync(symptoms: List[str], assessment: str, patient_age: int = None) -> Dict[str, Any]:
+    """Identify medical condition from symptoms and assessment."""
+    # Input validation
+    if not symptoms and not assessment:
+        raise ValidationError(ErrorDetails(
+            code=ErrorCode.INSUFFICIENT_PATIENT_DATA,
+            message="Either symptoms or assessment must be provided",
+            details={"symptoms": symptoms, "assessment": assessment}
+        ))
+    
+    if patient_age is not None and (patient_age < 0 or patient_age > 150):
+        raise ValidationError(ErrorDetails(
+            code=ErrorCode.INVALID_PATIENT_DATA,
+            message="Patient age must be between 0 and 150 years",
+            details={"provided_age": patient_age}
+        ))
+    
+    # Load conditions data
+    conditions = load_json_data(CONDITIONS_FILE)
+    check_data_availability(conditions, "conditions")
+    
+    # Compare NFC text against the condition keywords
+    if assessment:
+        assessment = normalize_text(assessment)
+    
+    cached_matches = _identify_condition_impl(
+        _ConditionsKey(conditions), tuple(symptoms or ()), assessment, patient_age
+    )
+    # Fresh containers around the read-only memoized matches, so callers can edit the result
+    matches = [
+        {**match, 'matched_symptoms': list(match['matched_symptoms'])}
+        for match in cached_matches
+    ]
+    return {
+        'success': True,
+        'matches': matches,
+        'top_match': matches[0] if matches else None,
+        'total_conditions_evaluated': len(conditions)
     }
 
 
+async def identify_condition(symptoms: List[str], assessment: str, patient_age: int = None) -> Dict[str, Any]:
+    """Identify medical condition from symptoms and assessment."""
+    return _identify_condition_sync(symptoms, assessment, patient_age)
+
+
 @handle_errors(global_error_handler)
-async def generate_treatment_plan(
+def _calculate_medication_dose_sync(
+    medication: str, 
+    condition: str, 
+    patient_weight: float, 
+    severity: str = "moderate"
+) -> Dict[str, Any]:
+    """Calculate weight-based medication dose."""
+    # Input validation
+    if not medication or not condition:
+        raise ValidationError(ErrorDetails(
+            code=ErrorCode.INSUFFICIENT_PATIENT_DATA,
+            message="Medication and condition must be provided",
+            details={"medication": medication, "condition": condition}
+        ))
+    
+    if patient_weight < 0.5 or patient_weight > 300.0:
+        raise ValidationError(ErrorDetails(
+            code=ErrorCode.INVALID_PATIENT_DATA,
+            message="Patient weight must be between 0.5 and 300 kg",
+            details={"provided_weight": patient_weight}
+        ))
+    
+    # No medication in the data has other characters, so skip loading it
+    if not _MEDICATION_NAME_RE.fullmatch(medication):
+        raise BusinessLogicError(ErrorDetails(
+            code=ErrorCode.MEDICATION_NOT_FOUND,
+            message=f"Medication '{medication}' not found for condition '{condition}'",
+            details={"medication": medication, "condition": condition}
+        ))
+    
+    # Load conditions data
+    conditions = load_json_data(CONDITIONS_FILE)
+    check_data_availability(conditions, "conditions")
+    
+    dose = _calculate_dose_impl(
+        _ConditionsKey(conditions), medication, normalize_text(condition), patient_weight, severity
+    )
+    # Fresh containers around the read-only memoized dose, so callers can edit the result
+    return {**dose, 'contraindications': list(dose['contraindications'])}
+
+
+async def calculate_medication_dose(
+    medication: str, 
+    condition: str, 
+    patient_weight: float, 
+    severity: str = "moderate"
+) -> Dict[str, Any]:
+    """Calculate weight-based medication dose."""
+    return _calculate_medication_dose_sync(medication, condition, patient_weight, severity)
+
+
+@handle_errors(global_error_handler)
+def _generate_treatment_plan_sync(
     condition: str, 
     severity: str, 
     patient_data: Dict[str, Any], 
@@ -285,12 +433,13 @@ async def generate_treatment_plan(
             details={"patient_data": patient_data}
         ))
     
-    from .tools.treatment_planner import generate_comprehensive_treatment_plan
+    from .tools.treatment_planner import _generate_comprehensive_treatment_plan_sync
     
     # Convert condition name to condition_id if needed
     conditions = load_json_data(CONDITIONS_FILE)
     check_data_availability(conditions, "conditions")
     
+    condition = normalize_text(condition)
     condition_id = condition
     
     # Find condition ID from name if needed
@@ -303,7 +452,7 @@ async def generate_treatment_plan(
     # Ensure condition exists
     check_condition_exists(condition_id, conditions)
     
-    result = await generate_comprehensive_treatment_plan(condition_id, severity, patient_data, calculated_doses)
+    result = _generate_comprehensive_treatment_plan_sync(condition_id, severity, patient_data, calculated_doses)
     
     if result.get('success'):
         return result['treatment_plan']
@@ -315,6 +464,167 @@ async def generate_treatment_plan(
         ))
 
 
+async def generate_treatment_plan(
+    condition: str, 
+    severity: str, 
+    patient_data: Dict[str, Any], 
+    calculated_doses: List[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Generate comprehensive treatment plan using enhanced planner."""
+    return _generate_treatment_plan_sync(condition, severity, patient_data, calculated_doses)
+
+
+# JSON Schemas for MCP tool arguments
+TOOL_INPUT_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "parse_clinical_note": {
+        "type": "object",
+        "properties": {
+            "clinical_note": {
+                "type": "string", 
+                "description": "Raw clinical note text containing patient information, symptoms, and assessment",
+                "minLength": 10,
+                "maxLength": 10000
+            }
+        },
+        "required": ["clinical_note"]
+    },
+    "identify_condition": {
+        "type": "object",
+        "properties": {
+            "symptoms": {
+                "type": "array", 
+                "items": {
+                    "type": "string",
+                    "minLength": 1,
+                    "maxLength": 100
+                }, 
+                "description": "List of clinical symptoms (e.g., 'barky cough', 'fever', 'stridor')",
+                "minItems": 0,
+                "maxItems": 20
+            },
+            "assessment": {
+                "type": "string", 
+                "description": "Clinical assessment text containing diagnosis or differential diagnosis",
+                "minLength": 1,
+                "maxLength": 1000
+            },
+            "patient_age": {
+                "type": "integer", 
+                "description": "Patient age in years (0-150)",
+                "minimum": 0,
+                "maximum": 150
+            }
+        },
+        "required": ["symptoms", "assessment"]
+    },
+    "calculate_medication_dose": {
+        "type": "object",
+        "properties": {
+            "medication": {
+                "type": "string", 
+                "description": "Medication name (e.g., 'dexamethasone', 'prednisolone', 'salbutamol')",
+                "minLength": 1,
+                "maxLength": 50,
+                "pattern": "^[a-zA-Z0-9\\s\\-]+$"
+            },
+            "condition": {
+                "type": "string", 
+                "description": "Medical condition identifier or name",
+                "minLength": 1,
+                "maxLength": 100
+            },
+            "patient_weight": {
+                "type": "number", 
+                "description": "Patient weight in kilograms (0.5-300 kg)",
+                "minimum": 0.5,
+                "maximum": 300.0,
+                "multipleOf": 0.1
+            },
+            "severity": {
+                "type": "string", 
+                "description": "Condition severity level",
+                "enum": ["mild", "moderate", "severe", "life-threatening"],
+                "default": "moderate"
+            }
+        },
+        "required": ["medication", "condition", "patient_weight"]
+    },
+    "generate_treatment_plan": {
+        "type": "object",
+        "properties": {
+            "condition": {
+                "type": "string", 
+                "description": "Medical condition identifier or name",
+                "minLength": 1,
+                "maxLength": 100
+            },
+            "severity": {
+                "type": "string", 
+                "description": "Condition severity level",
+                "enum": ["mild", "moderate", "severe", "life-threatening"]
+            },
+            "patient_data": {
+                "type": "object", 
+                "description": "Structured patient data containing demographics and clinical information",
+                "properties": {
+                    "age": {"type": "integer", "minimum": 0, "maximum": 150},
+                    "weight": {"type": "number", "minimum": 0.5, "maximum": 300.0},
+                    "name": {"type": "string", "minLength": 1, "maxLength": 100},
+                    "symptoms": {"type": "array", "items": {"type": "string"}},
+                    "assessment": {"type": "string", "minLength": 1, "maxLength": 1000}
+                },
+                "required": ["age", "weight"],
+                "additionalProperties": True
+            },
+            "calculated_doses": {
+                "type": "array", 
+                "description": "List of calculated medication doses with dosing information",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "medication": {"type": "string"},
+                        "final_dose": {"type": "number"},
+                        "unit": {"type": "string"},
+                        "route": {"type": "string"},
+                        "frequency": {"type": "string"}
+                    }
+                },
+                "maxItems": 10
+            }
+        },
+        "required": ["condition", "severity", "patient_data"]
+    }
+}
+
+def dump_json_text(payload: Dict[str, Any]) -> str:
+    """Serialize a tool result or error response to indented JSON text."""
+    # orjson writes non-finite floats (e.g. an unbounded max_dose) as null, keeping output valid JSON
+    return orjson.dumps(payload, default=str, option=orjson.OPT_INDENT_2).decode()
+
+
+# Validators are compiled once at import rather than on every tool call
+_TOOL_VALIDATORS = {
+    name: Draft202012Validator(schema)
+    for name, schema in TOOL_INPUT_SCHEMAS.items()
+}
+
+
+def validate_tool_arguments(name: str, arguments: Dict[str, Any]) -> None:
+    """Validate MCP tool arguments against the tool's precompiled schema."""
+    validator = _TOOL_VALIDATORS.get(name)
+    if validator is None:
+        return
+    
+    # Fail fast on the first schema violation instead of collecting them all
+    error = next(validator.iter_errors(arguments), None)
+    if error is not None:
+        raise ValidationError(ErrorDetails(
+            code=ErrorCode.MCP_INVALID_ARGUMENTS,
+            message=f"Invalid arguments for {name}: {error.message}",
+            details={"tool_name": name, "path": list(error.absolute_path)}
+        ))
+
+
 @app.list_tools()
 async def list_tools():
     """List all available MCP tools."""
@@ -322,136 +632,22 @@ async def list_tools():
         Tool(
             name="parse_clinical_note",
             description="Parse clinical note and extract structured patient data",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "clinical_note": {
-                        "type": "string", 
-                        "description": "Raw clinical note text containing patient information, symptoms, and assessment",
-                        "minLength": 10,
-                        "maxLength": 10000
-                    }
-                },
-                "required": ["clinical_note"]
-            }
+            inputSchema=TOOL_INPUT_SCHEMAS["parse_clinical_note"]
         ),
         Tool(
             name="identify_condition",
             description="Identify medical condition from symptoms and assessment",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symptoms": {
-                        "type": "array", 
-                        "items": {
-                            "type": "string",
-                            "minLength": 1,
-                            "maxLength": 100
-                        }, 
-                        "description": "List of clinical symptoms (e.g., 'barky cough', 'fever', 'stridor')",
-                        "minItems": 0,
-                        "maxItems": 20
-                    },
-                    "assessment": {
-                        "type": "string", 
-                        "description": "Clinical assessment text containing diagnosis or differential diagnosis",
-                        "minLength": 1,
-                        "maxLength": 1000
-                    },
-                    "patient_age": {
-                        "type": "integer", 
-                        "description": "Patient age in years (0-150)",
-                        "minimum": 0,
-                        "maximum": 150
-                    }
-                },
-                "required": ["symptoms", "assessment"]
-            }
+            inputSchema=TOOL_INPUT_SCHEMAS["identify_condition"]
         ),
         Tool(
             name="calculate_medication_dose",
             description="Calculate weight-based medication dose",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "medication": {
-                        "type": "string", 
-                        "description": "Medication name (e.g., 'dexamethasone', 'prednisolone', 'salbutamol')",
-                        "minLength": 1,
-                        "maxLength": 50,
-                        "pattern": "^[a-zA-Z0-9\\s\\-]+$"
-                    },
-                    "condition": {
-                        "type": "string", 
-                        "description": "Medical condition identifier or name",
-                        "minLength": 1,
-                        "maxLength": 100
-                    },
-                    "patient_weight": {
-                        "type": "number", 
-                        "description": "Patient weight in kilograms (0.5-300 kg)",
-                        "minimum": 0.5,
-                        "maximum": 300.0,
-                        "multipleOf": 0.1
-                    },
-                    "severity": {
-                        "type": "string", 
-                        "description": "Condition severity level",
-                        "enum": ["mild", "moderate", "severe", "life-threatening"],
-                        "default": "moderate"
-                    }
-                },
-                "required": ["medication", "condition", "patient_weight"]
-            }
+            inputSchema=TOOL_INPUT_SCHEMAS["calculate_medication_dose"]
         ),
         Tool(
             name="generate_treatment_plan",
             description="Generate comprehensive treatment plan",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "condition": {
-                        "type": "string", 
-                        "description": "Medical condition identifier or name",
-                        "minLength": 1,
-                        "maxLength": 100
-                    },
-                    "severity": {
-                        "type": "string", 
-                        "description": "Condition severity level",
-                        "enum": ["mild", "moderate", "severe", "life-threatening"]
-                    },
-                    "patient_data": {
-                        "type": "object", 
-                        "description": "Structured patient data containing demographics and clinical information",
-                        "properties": {
-                            "age": {"type": "integer", "minimum": 0, "maximum": 150},
-                            "weight": {"type": "number", "minimum": 0.5, "maximum": 300.0},
-                            "name": {"type": "string", "minLength": 1, "maxLength": 100},
-                            "symptoms": {"type": "array", "items": {"type": "string"}},
-                            "assessment": {"type": "string", "minLength": 1, "maxLength": 1000}
-                        },
-                        "required": ["age", "weight"],
-                        "additionalProperties": true
-                    },
-                    "calculated_doses": {
-                        "type": "array", 
-                        "description": "List of calculated medication doses with dosing information",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "medication": {"type": "string"},
-                                "final_dose": {"type": "number"},
-                                "unit": {"type": "string"},
-                                "route": {"type": "string"},
-                                "frequency": {"type": "string"}
-                            }
-                        },
-                        "maxItems": 10
-                    }
-                },
-                "required": ["condition", "severity", "patient_data"]
-            }
+            inputSchema=TOOL_INPUT_SCHEMAS["generate_treatment_plan"]
         )
     ]
 
@@ -494,10 +690,10 @@ async def call_tool(name: str, arguments: dict):
                     details={"tool_name": name, "available_tools": ["parse_clinical_note", "identify_condition", "calculate_medication_dose", "generate_treatment_plan"]}
                 ))
             )
-            return [TextContent(text=json.dumps(error_response, indent=2))]
+            return [TextContent(text=dump_json_text(error_response))]
         
         # Return successful result
-        return [TextContent(text=json.dumps(result, indent=2))]
+        return [TextContent(text=dump_json_text(result))]
             
     except Exception as e:
         # Handle all errors through the global error handler
@@ -505,7 +701,7 @@ async def call_tool(name: str, arguments: dict):
             "tool_name": name,
             "arguments": arguments
         })
-        return [TextContent(text=json.dumps(error_response, indent=2))]
+        return [TextContent(text=dump_json_text(error_response))]
 
 
 def main():
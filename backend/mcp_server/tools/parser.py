@@ -2,107 +2,253 @@
 Clinical note parsing tools for extracting structured data from unstructured text.
 """
 
+import asyncio
 import re
 import logging
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Pattern, Set, Tuple
+from ..utils.text import normalize_text
 from ..schemas.patient import PatientData, VitalSigns, ClinicalNote, ParsedClinicalNote
 
 logger = logging.getLogger(__name__)
 
 
+def _compile_patterns(patterns: List[str], flags: int = re.IGNORECASE) -> Tuple[Pattern, ...]:
+    """Compile an ordered list of alternative patterns once at import."""
+    return tuple(re.compile(pattern, flags) for pattern in patterns)
+
+
+# Symptoms reported by the parser, in display order
+SYMPTOM_PATTERNS = (
+    r'barky cough',
+    r'hoarse voice',
+    r'stridor',
+    r'fever',
+    r'recession',
+    r'work of breathing',
+    r'wheeze',
+    r'cough',
+    r'sore throat',
+    r'runny nose',
+    r'congestion',
+    r'difficulty breathing',
+    r'shortness of breath',
+    r'chest pain',
+    r'fatigue',
+    r'headache',
+    r'nausea',
+    r'vomiting',
+    r'diarrhea',
+    r'abdominal pain',
+)
+# Display labels, cleaned once rather than per match
+_SYMPTOM_LABELS = tuple(
+    pattern.replace(r'\\b', '').replace(r'\\', '') for pattern in SYMPTOM_PATTERNS
+)
+
+
+
+# Field extraction patterns, tried in order until one matches. Numbers use unambiguous
+# quantifiers (\d+(?:\.\d*)? rather than \d+\.?\d*) and leading numbers only start at a
+# digit-run boundary, so notes without a match do not backtrack through every split of a number
+AGE_PATTERNS = _compile_patterns([
+    r'Age:\s*(\d+)\s*years?',
+    r'(?<!\d)(\d+)\s*years?\s*old',
+    r'(?<!\d)(\d+)\s*yo',
+    r'Age\s*(\d+)'
+])
+
+WEIGHT_PATTERNS = _compile_patterns([
+    r'Weight:\s*(\d+(?:\.\d*)?)\s*kg',
+    r'(?<!\d)(\d+(?:\.\d*)?)\s*kg',
+    r'Wt:\s*(\d+(?:\.\d*)?)\s*kg'
+])
+
+HEIGHT_PATTERNS = _compile_patterns([
+    r'Height:\s*(\d+(?:\.\d*)?)\s*cm',
+    r'(?<!\d)(\d+(?:\.\d*)?)\s*cm',
+    r'Ht:\s*(\d+(?:\.\d*)?)\s*cm'
+])
+
+DOB_PATTERNS = _compile_patterns([
+    r'DOB:\s*(\d{1,2}/\d{1,2}/\d{4})',
+    r'Date of birth:\s*(\d{1,2}/\d{1,2}/\d{4})',
+    r'Born:\s*(\d{1,2}/\d{1,2}/\d{4})'
+])
+
+GENDER_PATTERNS = _compile_patterns([
+    r'Gender:\s*(male|female|M|F)',
+    r'Sex:\s*(male|female|M|F)',
+    r'\b(male|female|M|F)\b'
+])
+
+TEMP_PATTERNS = _compile_patterns([
+    r'T\s*(\d+(?:\.\d*)?)[°C]?',
+    r'Temp:\s*(\d+(?:\.\d*)?)[°C]?',
+    r'Temperature:\s*(\d+(?:\.\d*)?)[°C]?',
+    r'(?<!\d)(\d+(?:\.\d*)?)[°C]'
+])
+
+HR_PATTERNS = _compile_patterns([
+    r'HR\s*(\d+)',
+    r'Heart rate:\s*(\d+)',
+    r'Pulse:\s*(\d+)',
+    r'(?<!\d)(\d+)\s*bpm'
+])
+
+RR_PATTERNS = _compile_patterns([
+    r'RR\s*(\d+)',
+    r'Respiratory rate:\s*(\d+)',
+    r'Resp:\s*(\d+)',
+    r'(?<!\d)(\d+)\s*breaths/min'
+])
+
+BP_PATTERNS = _compile_patterns([
+    r'BP\s*(\d+/\d+)',
+    r'Blood pressure:\s*(\d+/\d+)',
+    r'(?<!\d)(\d+/\d+)\s*mmHg'
+])
+
+SPO2_PATTERNS = _compile_patterns([
+    r'O2\s*sat:\s*(\d+)%?',
+    r'SpO2:\s*(\d+)%?',
+    r'Oxygen saturation:\s*(\d+)%?',
+    r'(?<!\d)(\d+)%\s*oxygen'
+])
+
+# Section headings in priority order; each heading is followed by its body text
+SECTION_ALIASES = {
+    'presenting_complaint': ['Presenting complaint', 'Chief complaint', 'CC'],
+    'history': ['History', 'HPI', 'History of present illness'],
+    'examination': ['Examination', 'Physical exam', 'PE'],
+    'assessment': ['Assessment', 'Diagnosis', 'Impression'],
+    'plan': ['Plan', 'Treatment', 'Management']
+}
+
+SECTION_PATTERNS = {
+    section_name: _compile_patterns([
+        re.escape(alias) + r':?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)' for alias in aliases
+    ], re.IGNORECASE | re.DOTALL)
+    for section_name, aliases in SECTION_ALIASES.items()
+}
+
+# All headings flattened, so one pass can locate every heading in the note
+_SECTION_HEADINGS = [alias for aliases in SECTION_ALIASES.values() for alias in aliases]
+
+# Kinds of literal term found by the shared note scan
+_SYMPTOM_TERM = 0
+_HEADING_TERM = 1
+
+# Symptom indices found, and the first offset of each section heading found
+_LiteralScan = Tuple[Set[int], Dict[int, int]]
+
+
+def _trie_pattern(terms: List[str]) -> str:
+    """Build a regex that matches the longest of the given literal terms."""
+    trie: Dict[str, Any] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def _node_pattern(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + _node_pattern(child) for char, child in node.items() if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional suffix, so a longer term wins over one it starts with
+        return f'(?:{body})?' if '' in node else body
+    
+    return _node_pattern(trie)
+
+
+def _build_literal_scanner() -> Tuple[Pattern, Dict[str, Tuple[Tuple[int, int], ...]]]:
+    """Build one regex over symptom terms and section headings, with the entries per term."""
+    # Both are plain phrases, so match them literally against lowercased text
+    terms: Dict[str, List[Tuple[int, int]]] = {}
+    for index, pattern in enumerate(SYMPTOM_PATTERNS):
+        terms.setdefault(pattern.lower(), []).append((_SYMPTOM_TERM, index))
+    for index, heading in enumerate(_SECTION_HEADINGS):
+        terms.setdefault(heading.lower(), []).append((_HEADING_TERM, index))
+    
+    # A zero-width lookahead reports only the longest term at each offset, so any other
+    # term found there is a prefix of the match; each term also carries the entries of
+    # its prefix terms ("cough" in "coughing")
+    term_entries = {
+        term: tuple(entry for other in terms if term.startswith(other) for entry in terms[other])
+        for term in terms
+    }
+    return re.compile(f'(?=({_trie_pattern(list(terms))}))'), term_entries
+
+
+_LITERAL_SCANNER, _LITERAL_TERM_ENTRIES = _build_literal_scanner()
+
+
+def _lowercase_aligned(text: str) -> str:
+    """Lowercase text, keeping every character at its original offset."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters lowercase to several (e.g. 'İ'); leave those unchanged
+    return ''.join(char if len(char.lower()) != 1 else char.lower() for char in text)
+
+
+def _scan_literals(text: str) -> _LiteralScan:
+    """Find symptom terms and section headings in a single pass over the note."""
+    symptoms = set()
+    headings = {}
+    for match in _LITERAL_SCANNER.finditer(_lowercase_aligned(text)):
+        for kind, index in _LITERAL_TERM_ENTRIES[match.group(1)]:
+            if kind == _SYMPTOM_TERM:
+                symptoms.add(index)
+            else:
+                # Matches arrive in text order, so the first one seen is the earliest
+                headings.setdefault(index, match.start())
+    return symptoms, headings
+
+
 class ClinicalNoteParser:
     """Parser for clinical notes with pattern matching and data extraction."""
     
     def __init__(self):
-        self.symptom_patterns = [
-            r'barky cough',
-            r'hoarse voice',
-            r'stridor',
-            r'fever',
-            r'recession',
-            r'work of breathing',
-            r'wheeze',
-            r'cough',
-            r'sore throat',
-            r'runny nose',
-            r'congestion',
-            r'difficulty breathing',
-            r'shortness of breath',
-            r'chest pain',
-            r'fatigue',
-            r'headache',
-            r'nausea',
-            r'vomiting',
-            r'diarrhea',
-            r'abdominal pain'
-        ]
+        self.symptom_patterns = SYMPTOM_PATTERNS
     
     def extract_demographics(self, text: str) -> PatientData:
         """Extract patient demographic information."""
         demographics = {}
         
         # Age extraction - multiple patterns
-        age_patterns = [
-            r'Age:\s*(\d+)\s*years?',
-            r'(\d+)\s*years?\s*old',
-            r'(\d+)\s*yo',
-            r'Age\s*(\d+)'
-        ]
-        
-        for pattern in age_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in AGE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 demographics['age'] = int(match.group(1))
                 break
         
         # Weight extraction
-        weight_patterns = [
-            r'Weight:\s*(\d+\.?\d*)\s*kg',
-            r'(\d+\.?\d*)\s*kg',
-            r'Wt:\s*(\d+\.?\d*)\s*kg'
-        ]
-        
-        for pattern in weight_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in WEIGHT_PATTERNS:
+            match = pattern.search(text)
             if match:
                 demographics['weight'] = float(match.group(1))
                 break
         
         # Height extraction
-        height_patterns = [
-            r'Height:\s*(\d+\.?\d*)\s*cm',
-            r'(\d+\.?\d*)\s*cm',
-            r'Ht:\s*(\d+\.?\d*)\s*cm'
-        ]
-        
-        for pattern in height_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in HEIGHT_PATTERNS:
+            match = pattern.search(text)
             if match:
                 demographics['height'] = float(match.group(1))
                 break
         
         # DOB extraction
-        dob_patterns = [
-            r'DOB:\s*(\d{1,2}/\d{1,2}/\d{4})',
-            r'Date of birth:\s*(\d{1,2}/\d{1,2}/\d{4})',
-            r'Born:\s*(\d{1,2}/\d{1,2}/\d{4})'
-        ]
-        
-        for pattern in dob_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in DOB_PATTERNS:
+            match = pattern.search(text)
             if match:
                 demographics['dob'] = match.group(1)
                 break
         
         # Gender extraction
-        gender_patterns = [
-            r'Gender:\s*(male|female|M|F)',
-            r'Sex:\s*(male|female|M|F)',
-            r'\b(male|female|M|F)\b'
-        ]
-        
-        for pattern in gender_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in GENDER_PATTERNS:
+            match = pattern.search(text)
             if match:
                 gender = match.group(1).lower()
                 if gender in ['m', 'male']:
@@ -118,126 +264,64 @@ class ClinicalNoteParser:
         vitals = {}
         
         # Temperature patterns
-        temp_patterns = [
-            r'T\s*(\d+\.?\d*)[°C]?',
-            r'Temp:\s*(\d+\.?\d*)[°C]?',
-            r'Temperature:\s*(\d+\.?\d*)[°C]?',
-            r'(\d+\.?\d*)[°C]'
-        ]
-        
-        for pattern in temp_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in TEMP_PATTERNS:
+            match = pattern.search(text)
             if match:
                 vitals['temperature'] = float(match.group(1))
                 break
         
         # Heart rate patterns
-        hr_patterns = [
-            r'HR\s*(\d+)',
-            r'Heart rate:\s*(\d+)',
-            r'Pulse:\s*(\d+)',
-            r'(\d+)\s*bpm'
-        ]
-        
-        for pattern in hr_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in HR_PATTERNS:
+            match = pattern.search(text)
             if match:
                 vitals['heart_rate'] = int(match.group(1))
                 break
         
         # Respiratory rate patterns
-        rr_patterns = [
-            r'RR\s*(\d+)',
-            r'Respiratory rate:\s*(\d+)',
-            r'Resp:\s*(\d+)',
-            r'(\d+)\s*breaths/min'
-        ]
-        
-        for pattern in rr_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in RR_PATTERNS:
+            match = pattern.search(text)
             if match:
                 vitals['respiratory_rate'] = int(match.group(1))
                 break
         
         # Blood pressure patterns
-        bp_patterns = [
-            r'BP\s*(\d+/\d+)',
-            r'Blood pressure:\s*(\d+/\d+)',
-            r'(\d+/\d+)\s*mmHg'
-        ]
-        
-        for pattern in bp_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in BP_PATTERNS:
+            match = pattern.search(text)
             if match:
                 vitals['blood_pressure'] = match.group(1)
                 break
         
         # Oxygen saturation patterns
-        spo2_patterns = [
-            r'O2\s*sat:\s*(\d+)%?',
-            r'SpO2:\s*(\d+)%?',
-            r'Oxygen saturation:\s*(\d+)%?',
-            r'(\d+)%\s*oxygen'
-        ]
-        
-        for pattern in spo2_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in SPO2_PATTERNS:
+            match = pattern.search(text)
             if match:
                 vitals['oxygen_saturation'] = float(match.group(1))
                 break
         
         return VitalSigns(**vitals)
     
-    def extract_symptoms(self, text: str) -> List[str]:
+    def extract_symptoms(self, text: str, literals: Optional[_LiteralScan] = None) -> List[str]:
         """Extract symptoms from clinical text."""
-        symptoms = []
-        
-        # Check for each symptom pattern
-        for pattern in self.symptom_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                # Clean up the pattern for display
-                symptom = pattern.replace(r'\\b', '').replace(r'\\', '')
-                if symptom not in symptoms:
-                    symptoms.append(symptom)
-        
-        return symptoms
+        # Reuse the note scan from parse() when given, then report symptoms in pattern order
+        found, _ = literals if literals is not None else _scan_literals(text)
+        return [_SYMPTOM_LABELS[index] for index in sorted(found)]
     
-    def extract_sections(self, text: str) -> Dict[str, str]:
+    def extract_sections(self, text: str, literals: Optional[_LiteralScan] = None) -> Dict[str, str]:
         """Extract structured sections from clinical note."""
         sections = {}
         
-        # Common section patterns
-        section_patterns = {
-            'presenting_complaint': [
-                r'Presenting complaint:?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)',
-                r'Chief complaint:?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)',
-                r'CC:?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)'
-            ],
-            'history': [
-                r'History:?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)',
-                r'HPI:?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)',
-                r'History of present illness:?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)'
-            ],
-            'examination': [
-                r'Examination:?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)',
-                r'Physical exam:?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)',
-                r'PE:?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)'
-            ],
-            'assessment': [
-                r'Assessment:?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)',
-                r'Diagnosis:?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)',
-                r'Impression:?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)'
-            ],
-            'plan': [
-                r'Plan:?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)',
-                r'Treatment:?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)',
-                r'Management:?\s*(.+?)(?=\n\n|\n[A-Z][a-z]+:|\Z)'
-            ]
-        }
+        # Where each heading first occurs, from the note scan shared with symptom extraction
+        _, first_seen = literals if literals is not None else _scan_literals(text)
         
-        for section_name, patterns in section_patterns.items():
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        # Only run the full section patterns for headings that are present
+        index = 0
+        for section_name, patterns in SECTION_PATTERNS.items():
+            start = index
+            index += len(patterns)
+            for heading_index, pattern in enumerate(patterns, start):
+                if heading_index not in first_seen:
+                    continue
+                match = pattern.search(text, first_seen[heading_index])
                 if match:
                     sections[section_name] = match.group(1).strip()
                     break
@@ -255,11 +339,14 @@ class ClinicalNoteParser:
             # Extract vital signs
             vitals = self.extract_vital_signs(clinical_note)
             
+            # Scan the note once for symptom terms and section headings
+            literals = _scan_literals(clinical_note)
+            
             # Extract symptoms
-            symptoms = self.extract_symptoms(clinical_note)
+            symptoms = self.extract_symptoms(clinical_note, literals)
             
             # Extract sections
-            sections = self.extract_sections(clinical_note)
+            sections = self.extract_sections(clinical_note, literals)
             
             # Create clinical note object
             clinical_note_obj = ClinicalNote(
@@ -292,17 +379,31 @@ class ClinicalNoteParser:
             )
 
 
-# Convenience function for MCP server
-async def parse_clinical_note(clinical_note: str) -> Dict[str, Any]:
+@lru_cache(maxsize=512)
+def _parse_cached(clinical_note: str) -> ParsedClinicalNote:
+    """Parse a normalized note; parsing is pure, so identical text reuses the result."""
+    return ClinicalNoteParser().parse(clinical_note)
+
+
+def clear_parse_cache() -> None:
+    """Drop memoized parse results."""
+    _parse_cached.cache_clear()
+
+
+def _parse_clinical_note_sync(clinical_note: str) -> Dict[str, Any]:
     """Parse clinical note and return structured data."""
-    parser = ClinicalNoteParser()
-    result = parser.parse(clinical_note)
+    # Normalize once so all downstream matching compares NFC to NFC
+    if isinstance(clinical_note, str):
+        result = _parse_cached(normalize_text(clinical_note))
+    else:
+        result = ClinicalNoteParser().parse(clinical_note)
     
+    # Build a fresh response each call so callers never share the cached result's state
     if result.success:
         return {
             'success': True,
             'patient_data': result.data.patient_data.dict(),
-            'symptoms': result.data.symptoms,
+            'symptoms': list(result.data.symptoms),
             'assessment': result.data.assessment,
             'vitals': result.data.vitals.dict(),
             'presenting_complaint': result.data.presenting_complaint,
@@ -314,5 +415,11 @@ async def parse_clinical_note(clinical_note: str) -> Dict[str, Any]:
         return {
             'success': False,
             'error': 'Failed to parse clinical note',
-            'errors': result.errors
-        }
\ No newline at end of file
+            'errors': list(result.errors)
+        }
+
+
+# Convenience function for MCP server
+async def parse_clinical_note(clinical_note: str) -> Dict[str, Any]:
+    """Parse clinical note and return structured data."""
+    return await asyncio.to_thread(_parse_clinical_note_sync, clinical_note)
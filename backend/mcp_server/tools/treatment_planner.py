@@ -2,14 +2,46 @@
 Enhanced treatment plan generator using clinical guidelines.
 """
 
-import json
+import copy
 import logging
+import os
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from pathlib import Path
+import orjson
 from ..schemas.patient import ClinicalNote
 
 logger = logging.getLogger(__name__)
 
+# Default data file locations, resolved once at import
+DATA_DIR = Path(__file__).parent.parent / "data"
+DEFAULT_CONDITIONS_FILE = DATA_DIR / "conditions.json"
+DEFAULT_GUIDELINES_FILE = DATA_DIR / "guidelines.json"
+
+
+def _read_json_file(file_path: Path) -> Dict[str, Any]:
+    """Load JSON data from file."""
+    try:
+        return orjson.loads(Path(file_path).read_bytes())
+    except FileNotFoundError:
+        logger.error(f"Data file not found: {file_path}")
+        return {}
+    except orjson.JSONDecodeError as e:
+        logger.error(f"Invalid JSON in file: {e}")
+        return {}
+
+
+@lru_cache(maxsize=16)
+def _load_json_data_cached(file_path: Path, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Memoized JSON load keyed on the file's path and stat signature."""
+    # Every planner shares the returned dict, so planners only ever read it
+    return _read_json_file(file_path)
+
+
+def clear_data_cache() -> None:
+    """Drop cached data files."""
+    _load_json_data_cached.cache_clear()
+
 
 class TreatmentPlanGenerator:
     """Generates comprehensive treatment plans based on clinical guidelines."""
@@ -17,11 +49,9 @@ class TreatmentPlanGenerator:
     def __init__(self, conditions_file: str = None, guidelines_file: str = None):
         """Initialize with data files."""
         if conditions_file is None:
-            base_path = Path(__file__).parent.parent / "data"
-            conditions_file = base_path / "conditions.json"
+            conditions_file = DEFAULT_CONDITIONS_FILE
         if guidelines_file is None:
-            base_path = Path(__file__).parent.parent / "data"
-            guidelines_file = base_path / "guidelines.json"
+            guidelines_file = DEFAULT_GUIDELINES_FILE
         
         self.conditions_file = conditions_file
         self.guidelines_file = guidelines_file
@@ -29,16 +59,13 @@ class TreatmentPlanGenerator:
         self.guidelines = self._load_json_data(guidelines_file)
     
     def _load_json_data(self, file_path: Path) -> Dict[str, Any]:
-        """Load JSON data from file."""
+        """Load JSON data from file, shared across planners until the file changes."""
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            logger.error(f"Data file not found: {file_path}")
-            return {}
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in file: {e}")
-            return {}
+            stat = os.stat(file_path)
+        except OSError:
+            # Let the uncached loader report the problem
+            return _read_json_file(file_path)
+        return _load_json_data_cached(Path(file_path), stat.st_mtime_ns, stat.st_size)
     
     def get_guideline_for_condition(self, condition_id: str) -> Optional[Dict[str, Any]]:
         """Find guideline that covers the given condition."""
@@ -202,11 +229,11 @@ class TreatmentPlanGenerator:
                 "last_updated": guideline.get('last_updated')
             }
         
-        return plan
+        # Plan sections alias the shared data files, so hand out an independent copy
+        return copy.deepcopy(plan)
 
 
-# Convenience function for MCP server
-async def generate_comprehensive_treatment_plan(
+def _generate_comprehensive_treatment_plan_sync(
     condition_id: str, 
     severity: str, 
     patient_data: Dict[str, Any], 
@@ -227,4 +254,15 @@ async def generate_comprehensive_treatment_plan(
         return {
             "success": False,
             "error": str(e)
-        }
\ No newline at end of file
+        }
+
+
+# Convenience function for MCP server
+async def generate_comprehensive_treatment_plan(
+    condition_id: str, 
+    severity: str, 
+    patient_data: Dict[str, Any], 
+    calculated_doses: List[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Generate comprehensive treatment plan."""
+    return _generate_comprehensive_treatment_plan_sync(condition_id, severity, patient_data, calculated_doses)
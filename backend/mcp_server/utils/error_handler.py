@@ -3,15 +3,17 @@ Comprehensive error handling utilities for the MCP server.
 """
 
 import logging
-import traceback
-from typing import Dict, Any, Optional, List
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple, Callable, Deque
 from enum import Enum
-from dataclasses import dataclass
-from functools import wraps
+from dataclasses import dataclass, field
+from functools import wraps, lru_cache
 
 
-class ErrorCode(Enum):
-    """Standard error codes for the application."""
+class ErrorCode(str, Enum):
+    """Standard error codes for the application (members are their own string values)."""
     
     # Data loading errors
     DATA_FILE_NOT_FOUND = "DATA_FILE_NOT_FOUND"
@@ -45,6 +47,10 @@ class ErrorCode(Enum):
     MCP_INVALID_ARGUMENTS = "MCP_INVALID_ARGUMENTS"
 
 
+# Plain string value for each code, resolved once instead of via Enum.value
+_CODE_VALUES: Dict[ErrorCode, str] = {code: code.value for code in ErrorCode}
+
+
 @dataclass
 class ErrorDetails:
     """Detailed error information."""
@@ -54,6 +60,25 @@ class ErrorDetails:
     suggestions: Optional[List[str]] = None
     recoverable: bool = True
     user_friendly_message: Optional[str] = None
+    code_str: str = field(init=False, repr=False)
+    timestamp: float = field(default_factory=time.time, init=False, repr=False, compare=False)
+    _timestamp_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Resolve the enum value once so response/log paths read a plain string
+        self.code_str = _CODE_VALUES[self.code]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a new plain dict; only the formatted timestamp is reused."""
+        if self._timestamp_iso is None:
+            self._timestamp_iso = datetime.fromtimestamp(self.timestamp).isoformat()
+        return {
+            "code": self.code_str,
+            "message": self.message,
+            "details": self.details,
+            "recoverable": self.recoverable,
+            "timestamp": self._timestamp_iso
+        }
 
 
 class ClinicalError(Exception):
@@ -92,9 +117,13 @@ class MCPError(ClinicalError):
 class ErrorHandler:
     """Centralized error handling and logging."""
     
-    def __init__(self, logger_name: str = __name__):
+    def __init__(self, logger_name: str = __name__, max_history: int = 1000, max_errors: Optional[int] = None):
         self.logger = logging.getLogger(logger_name)
         self.error_mappings = self._setup_error_mappings()
+        # Bounded history so a long-running server can't grow it without limit
+        self.error_history: Deque[ErrorDetails] = deque(maxlen=max_history)
+        self.max_errors = max_errors
+        self._logged_errors = 0
     
     def _setup_error_mappings(self) -> Dict[ErrorCode, Dict[str, Any]]:
         """Setup error code mappings with user-friendly messages."""
@@ -153,7 +182,7 @@ class ErrorHandler:
         response = {
             "success": False,
             "error": {
-                "code": error.error_details.code.value,
+                "code": error.error_details.code_str,
                 "message": error.error_details.message,
                 "user_message": error.error_details.user_friendly_message or error_mapping.get("user_message"),
                 "recoverable": error.error_details.recoverable and error_mapping.get("recoverable", True),
@@ -168,8 +197,14 @@ class ErrorHandler:
     
     def log_error(self, error: ClinicalError, context: Optional[Dict[str, Any]] = None):
         """Log error with appropriate level and context."""
+        # Stop recording and logging once max_errors have been logged
+        if self.max_errors is not None and self._logged_errors >= self.max_errors:
+            return
+        self._logged_errors += 1
+        self.error_history.append(error.error_details)
+        
         log_data = {
-            "error_code": error.error_details.code.value,
+            "error_code": error.error_details.code_str,
             "message": error.error_details.message,
             "recoverable": error.error_details.recoverable
         }
@@ -250,23 +285,63 @@ def validate_patient_data(patient_data: Dict[str, Any]) -> None:
             details={"provided_data": patient_data}
         ))
     
-    age = patient_data.get('age')
-    if age is not None:
-        if not isinstance(age, (int, float)) or age < 0 or age > 150:
-            raise ValidationError(ErrorDetails(
-                code=ErrorCode.INVALID_PATIENT_DATA,
-                message="Age must be between 0 and 150 years",
-                details={"provided_age": age}
-            ))
+    _validate_patient_fields(patient_data.get('age'), patient_data.get('weight'))
+
+
+def _validate_patient_fields(age: Any, weight: Any) -> None:
+    """Validate the age and weight ranges."""
+    _patient_validator({'age': age, 'weight': weight})
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """Range check for a single numeric field of a known payload schema."""
+    name: str
+    types: Tuple[type, ...]
+    minimum: float
+    maximum: float
+    message: str
+    exclusive_minimum: bool = False
+
+
+PATIENT_DATA_SCHEMA: Tuple[FieldRule, ...] = (
+    FieldRule('age', (int, float), 0, 150, "Age must be between 0 and 150 years"),
+    FieldRule('weight', (int, float), 0, 500, "Weight must be between 0.5 and 500 kg",
+              exclusive_minimum=True),
+)
+
+
+def _raise_invalid_field(message: str, field_name: str, value: Any) -> None:
+    raise ValidationError(ErrorDetails(
+        code=ErrorCode.INVALID_PATIENT_DATA,
+        message=message,
+        details={f"provided_{field_name}": value}
+    ))
+
+
+@lru_cache(maxsize=32)
+def compile_validator(schema: Tuple[FieldRule, ...]) -> Callable[[Dict[str, Any]], None]:
+    """Generate a straight-line validator for a fixed payload schema."""
+    namespace: Dict[str, Any] = {"_fail": _raise_invalid_field}
+    lines = ["def _validate(data):"]
+    
+    for i, rule in enumerate(schema):
+        namespace[f"_types_{i}"] = rule.types
+        low_op = "<=" if rule.exclusive_minimum else "<"
+        lines.append(f"    v = data.get({rule.name!r})")
+        lines.append(
+            f"    if v is not None and (not isinstance(v, _types_{i}) "
+            f"or v {low_op} {rule.minimum!r} or v > {rule.maximum!r}):"
+        )
+        lines.append(f"        _fail({rule.message!r}, {rule.name!r}, v)")
     
-    weight = patient_data.get('weight')
-    if weight is not None:
-        if not isinstance(weight, (int, float)) or weight <= 0 or weight > 500:
-            raise ValidationError(ErrorDetails(
-                code=ErrorCode.INVALID_PATIENT_DATA,
-                message="Weight must be between 0.5 and 500 kg",
-                details={"provided_weight": weight}
-            ))
+    lines.append("    return None")
+    exec("\n".join(lines), namespace)
+    return namespace["_validate"]
+
+
+# Compiled once at import so cold starts pay the codegen cost a single time
+_patient_validator = compile_validator(PATIENT_DATA_SCHEMA)
 
 
 def validate_medication_dose(dose: float, min_dose: float, max_dose: float, medication: str) -> None:
@@ -315,33 +390,30 @@ def check_condition_exists(condition_id: str, conditions: Dict[str, Any]) -> Non
         ))
 
 
-def check_medication_exists(medication: str, condition_id: str, medications: Dict[str, Any]) -> None:
-    """Check if medication exists for condition."""
-    found = False
-    for med_line in medications.values():
-        if medication in med_line:
-            found = True
-            break
+def check_medication_exists(medication: str, condition_id: str, medications: Dict[str, Any]) -> str:
+    """Check if medication exists for condition and return its medication line."""
+    for med_line, line_meds in medications.items():
+        if medication in line_meds:
+            return med_line
     
-    if not found:
-        available_meds = []
-        for med_line in medications.values():
-            available_meds.extend(med_line.keys())
-        
-        raise BusinessLogicError(ErrorDetails(
-            code=ErrorCode.MEDICATION_NOT_FOUND,
-            message=f"Medication '{medication}' not found for condition '{condition_id}'",
-            details={
-                "medication": medication,
-                "condition_id": condition_id,
-                "available_medications": available_meds
-            },
-            suggestions=[
-                "Check medication spelling",
-                "Consider alternative medications",
-                f"Available medications: {', '.join(available_meds)}"
-            ]
-        ))
+    available_meds = []
+    for line_meds in medications.values():
+        available_meds.extend(line_meds.keys())
+    
+    raise BusinessLogicError(ErrorDetails(
+        code=ErrorCode.MEDICATION_NOT_FOUND,
+        message=f"Medication '{medication}' not found for condition '{condition_id}'",
+        details={
+            "medication": medication,
+            "condition_id": condition_id,
+            "available_medications": available_meds
+        },
+        suggestions=[
+            "Check medication spelling",
+            "Consider alternative medications",
+            f"Available medications: {', '.join(available_meds)}"
+        ]
+    ))
 
 
 # Global error handler instance
@@ -0,0 +1,15 @@
+"""
+Text normalization helpers shared by the parser and MCP tools.
+"""
+
+import unicodedata
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def normalize_text(text: str) -> str:
+    """NFC-normalize text, returning ASCII or already-NFC input unchanged."""
+    # Quick checks avoid the full decompose/recompose pass for the common case
+    if text.isascii() or unicodedata.is_normalized('NFC', text):
+        return text
+    return unicodedata.normalize('NFC', text)
@@ -43,7 +43,7 @@ def check_environment():
         print("✅ Python dependencies are installed")
     except ImportError as e:
         print(f"❌ Error: Missing Python dependency: {e}")
-        print("💡 Run: pip3 install -r requirements.txt")
+        print("💡 Run: pip3 install -r requirements-dev.txt")
         return False
     
     print("✅ Local development environment is ready!")
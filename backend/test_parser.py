@@ -7,8 +7,6 @@ import os
 # Add the backend directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from mcp_server.tools.parser import ClinicalNoteParser
-
 # Sample clinical note from CLAUDE.md
 sample_note = """
 Patient: Jack T.
@@ -32,6 +30,8 @@ async def test_parser():
     print("Testing Clinical Note Parser")
     print("=" * 50)
     
+    from mcp_server.tools.parser import ClinicalNoteParser
+    
     # Create parser instance
     parser = ClinicalNoteParser()
     
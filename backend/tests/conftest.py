@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Shared pytest configuration for the backend test suite.
+"""
+
+import asyncio
+import importlib
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add the backend directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mcp_server.server import load_json_data, clear_data_cache, CONDITIONS_FILE, _data_override_var
+from mcp_server.tools.parser import clear_parse_cache, _parse_clinical_note_sync
+from mcp_server.utils.error_handler import DataError, ErrorCode, ErrorDetails
+
+# Run async tests on libuv's event loop where available (not supported on Windows)
+if sys.platform != 'win32':
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _parse_cache_session():
+    """Share memoized note parses across the session, dropping them at the end."""
+    yield
+    clear_parse_cache()
+
+
+@pytest.fixture(autouse=True)
+def _isolate_data_cache():
+    """Start every test with empty data and tool-result caches."""
+    clear_data_cache()
+    yield
+    clear_data_cache()
+
+
+# Sample clinical note from CLAUDE.md, shared by the parser and server tests
+SAMPLE_NOTE = """
+Patient: Jack T.
+DOB: 12/03/2022
+Age: 3 years
+Weight: 14.2 kg
+
+Presenting complaint:
+Jack presented with a 2-day history of barky cough, hoarse voice, and low-grade fever. Symptoms worsened overnight, with increased work of breathing and stridor noted at rest this morning.
+
+Assessment:
+Jack presents with classic features of moderate croup (laryngotracheobronchitis), likely viral in origin.
+
+Plan:
+- Administer corticosteroids
+- Plan as per local guidelines for croup
+"""
+
+
+@pytest.fixture(scope="session")
+def sample_note():
+    """Sample clinical note text."""
+    return SAMPLE_NOTE
+
+
+@pytest.fixture(scope="session")
+def parsed_sample_note(sample_note):
+    """Sample note parsed once per session; treat as read-only."""
+    return _parse_clinical_note_sync(sample_note)
+
+
+@pytest.fixture(scope="session")
+def loaded_data():
+    """Conditions data loaded once per test session."""
+    return load_json_data(CONDITIONS_FILE)
+
+
+@pytest.fixture
+def data_override():
+    """Serve in-memory data from load_json_data for the duration of a test."""
+    overrides = {}
+    token = _data_override_var.set(overrides)
+    yield overrides
+    _data_override_var.reset(token)
+
+
+# Built once; each failed load raises a fresh DataError around it
+NOT_FOUND_DETAILS = ErrorDetails(
+    code=ErrorCode.DATA_FILE_NOT_FOUND,
+    message="Data file not found",
+    details={},
+    recoverable=False
+)
+
+
+@pytest.fixture
+def missing_data_files(monkeypatch):
+    """Make every server data load fail as if the file were missing."""
+    def _missing(file_path):
+        raise DataError(NOT_FOUND_DETAILS)
+    monkeypatch.setattr('mcp_server.server.load_json_data', _missing)
+
+
+@pytest.fixture
+def patch_file_contents(tmp_path):
+    """Patch a module's _read_json_file to read the given text instead of the requested file."""
+    def _patch(content: str, module: str = 'mcp_server.server'):
+        data_file = tmp_path / 'data.json'
+        data_file.write_text(content, encoding='utf-8')
+        read_json_file = importlib.import_module(module)._read_json_file
+        return patch(f'{module}._read_json_file', lambda file_path: read_json_file(data_file))
+    return _patch
@@ -5,12 +5,8 @@ Unit tests for error handling functionality.
 
 import pytest
 import json
-from pathlib import Path
-from unittest.mock import patch, mock_open
-import sys
-
-# Add the backend directory to the path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from decimal import Decimal
+from unittest.mock import patch
 
 from mcp_server.utils.error_handler import (
     ErrorHandler, handle_errors, global_error_handler,
@@ -54,6 +50,23 @@ class TestErrorDetails:
         assert result["details"]["condition_id"] == "invalid"
         assert result["recoverable"] is False
         assert "timestamp" in result
+    
+    def test_error_details_to_dict_returns_new_dict(self):
+        """Test mutating one serialized dict does not affect later calls."""
+        details = ErrorDetails(code=ErrorCode.CONDITION_NOT_FOUND, message="Condition not found")
+        
+        first = details.to_dict()
+        first["message"] = "changed"
+        second = details.to_dict()
+        
+        assert second is not first
+        assert second["message"] == "Condition not found"
+        assert second["timestamp"] == first["timestamp"]
+    
+    def test_error_code_is_plain_string(self):
+        """Test error codes compare and serialize as their string values."""
+        assert ErrorCode.CONDITION_NOT_FOUND == "CONDITION_NOT_FOUND"
+        assert json.dumps({"code": ErrorCode.CONDITION_NOT_FOUND}) == '{"code": "CONDITION_NOT_FOUND"}'
 
 
 class TestCustomExceptions:
@@ -216,6 +229,12 @@ class TestValidationFunctions:
             validate_patient_data(age=30, weight=1000.0)
         assert exc_info.value.details.code == ErrorCode.INVALID_PATIENT_DATA
     
+    def test_validate_patient_data_rejects_non_numeric_types(self):
+        """Test that age/weight values of other numeric types are rejected."""
+        with pytest.raises(ValidationError) as exc_info:
+            validate_patient_data({'age': Decimal(5), 'weight': Decimal(20)})
+        assert exc_info.value.error_details.code == ErrorCode.INVALID_PATIENT_DATA
+    
     def test_validate_medication_dose_success(self):
         """Test successful medication dose validation."""
         # Valid doses should not raise exception
@@ -301,6 +320,32 @@ class TestErrorHandler:
         last_error = handler.get_last_error()
         assert last_error == error_details
         assert last_error.message == "Last error"
+    
+    def test_error_handler_history_is_bounded(self):
+        """Test history keeps only the most recent errors."""
+        handler = ErrorHandler(max_history=2)
+        
+        for i in range(5):
+            handler.log_error(ValidationError(ErrorDetails(
+                code=ErrorCode.INVALID_PATIENT_DATA,
+                message=f"Test error {i}"
+            )))
+        
+        assert [e.message for e in handler.error_history] == ["Test error 3", "Test error 4"]
+    
+    def test_error_handler_stops_after_max_errors(self):
+        """Test log_error stops recording once max_errors have been logged."""
+        handler = ErrorHandler(max_errors=2)
+        
+        with patch.object(handler.logger, 'warning') as mock_warning:
+            for i in range(5):
+                handler.log_error(ValidationError(ErrorDetails(
+                    code=ErrorCode.INVALID_PATIENT_DATA,
+                    message=f"Test error {i}"
+                )))
+        
+        assert [e.message for e in handler.error_history] == ["Test error 0", "Test error 1"]
+        assert mock_warning.call_count == 2
 
 
 class TestErrorDecorator:
@@ -4,333 +4,267 @@ Integration tests for the complete MCP server workflow.
 """
 
 import pytest
-import json
 import asyncio
-from pathlib import Path
-from unittest.mock import patch, mock_open
-import sys
-
-# Add the backend directory to the path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from time import perf_counter
+from types import MappingProxyType
 
 from mcp_server.server import (
     parse_clinical_note,
+    _parse_clinical_note_sync,
     identify_condition,
     calculate_medication_dose,
-    generate_treatment_plan
+    generate_treatment_plan,
+    CONDITIONS_FILE
 )
 from mcp_server.utils.error_handler import ErrorCode
 
+# Symptoms the parser must extract from the croup sample notes
+CROUP_EARLY_SYMPTOMS = frozenset({'barky cough', 'hoarse voice'})
+CROUP_SYMPTOMS = CROUP_EARLY_SYMPTOMS | {'stridor'}
 
-class TestMCPServerIntegration:
-    """Integration tests for the complete MCP server workflow."""
-    
-    @pytest.fixture
-    def sample_clinical_note(self):
-        """Sample clinical note from CLAUDE.md."""
-        return """
-Patient: Jack T.
-DOB: 12/03/2022
-Age: 3 years
-Weight: 14.2 kg
+ALTERNATIVE_CLINICAL_NOTE = """
+Patient: Emma S.
+Age: 2 years
+Weight: 12.5 kg
 
 Presenting complaint:
-Jack presented with a 2-day history of barky cough, hoarse voice, and low-grade fever. Symptoms worsened overnight, with increased work of breathing and stridor noted at rest this morning.
+Emma presented with a 1-day history of harsh barky cough and hoarse voice. 
+Mother reports the cough sounds like a seal bark. No fever reported.
+Child is eating and drinking normally.
 
 Assessment:
-Jack presents with classic features of moderate croup (laryngotracheobronchitis), likely viral in origin.
+Mild croup (laryngotracheobronchitis). No stridor at rest.
 
 Plan:
-- Administer corticosteroids
-- Plan as per local guidelines for croup
+- Supportive care
+- Consider corticosteroids if symptoms worsen
 """
+
+MINIMAL_CLINICAL_NOTE = "3-year-old child with barky cough and hoarse voice."
+
+# note (None for the conftest sample note), age, weight, symptoms, severity,
+# expected dexamethasone dose (0.15 mg/kg)
+WORKFLOW_SCENARIOS = [
+    pytest.param(None, 3, 14.2, CROUP_SYMPTOMS, 'moderate', 2.13, id='sample'),
+    pytest.param(ALTERNATIVE_CLINICAL_NOTE, 2, 12.5, CROUP_EARLY_SYMPTOMS, 'mild', 1.875, id='alternative'),
+    pytest.param(MINIMAL_CLINICAL_NOTE, 3, None, CROUP_EARLY_SYMPTOMS, 'mild', None, id='minimal'),
+]
+
+
+# Read-only conditions data shared by every test instead of being rebuilt per test
+MOCK_CONDITIONS_DATA = MappingProxyType({
+    'croup': MappingProxyType({
+        'name': 'Croup (Laryngotracheobronchitis)',
+        'description': 'Viral infection of the larynx and trachea',
+        'icd_codes': ['J05.0'],
+        'age_groups': ['pediatric'],
+        'symptoms': {
+            'primary': ['barky cough', 'hoarse voice', 'stridor'],
+            'secondary': ['fever', 'rhinitis', 'pharyngitis']
+        },
+        'severity_scales': {
+            'mild': 'Occasional barky cough, no stridor at rest',
+            'moderate': 'Frequent barky cough, stridor at rest, mild respiratory distress',
+            'severe': 'Continuous barky cough, stridor at rest, significant respiratory distress'
+        },
+        'medications': {
+            'first_line': {
+                'dexamethasone': {
+                    'dose_mg_per_kg': 0.15,
+                    'max_dose_mg': 10.0,
+                    'min_dose_mg': 0.6,
+                    'route': 'oral',
+                    'frequency': 'single_dose',
+                    'duration': '1 day',
+                    'age_restrictions': 'All ages',
+                    'contraindications': ['known hypersensitivity']
+                }
+            }
+        },
+        'clinical_pearls': [
+            'Most cases are viral in origin',
+            'Peak incidence in autumn',
+            'Supportive care is often sufficient'
+        ],
+        'red_flags': [
+            'cyanosis',
+            'drooling',
+            'inability to swallow',
+            'toxic appearance'
+        ]
+    })
+})
+
+
+class TestMCPServerIntegration:
+    """Integration tests for the complete MCP server workflow."""
     
     @pytest.fixture
     def mock_conditions_data(self):
         """Mock conditions data for integration testing."""
-        return {
-            'croup': {
-                'name': 'Croup (Laryngotracheobronchitis)',
-                'description': 'Viral infection of the larynx and trachea',
-                'icd_codes': ['J05.0'],
-                'age_groups': ['pediatric'],
-                'symptoms': {
-                    'primary': ['barky cough', 'hoarse voice', 'stridor'],
-                    'secondary': ['fever', 'rhinitis', 'pharyngitis']
-                },
-                'severity_scales': {
-                    'mild': 'Occasional barky cough, no stridor at rest',
-                    'moderate': 'Frequent barky cough, stridor at rest, mild respiratory distress',
-                    'severe': 'Continuous barky cough, stridor at rest, significant respiratory distress'
-                },
-                'medications': {
-                    'first_line': {
-                        'dexamethasone': {
-                            'dose_mg_per_kg': 0.15,
-                            'max_dose_mg': 10.0,
-                            'min_dose_mg': 0.6,
-                            'route': 'oral',
-                            'frequency': 'single_dose',
-                            'duration': '1 day',
-                            'age_restrictions': 'All ages',
-                            'contraindications': ['known hypersensitivity']
-                        }
-                    }
-                },
-                'clinical_pearls': [
-                    'Most cases are viral in origin',
-                    'Peak incidence in autumn',
-                    'Supportive care is often sufficient'
-                ],
-                'red_flags': [
-                    'cyanosis',
-                    'drooling',
-                    'inability to swallow',
-                    'toxic appearance'
-                ]
-            }
-        }
+        return MOCK_CONDITIONS_DATA
     
     @pytest.mark.asyncio
-    async def test_complete_workflow_success(self, sample_clinical_note, mock_conditions_data):
+    @pytest.mark.parametrize(
+        'note,expected_age,expected_weight,expected_symptoms,severity,expected_dose',
+        WORKFLOW_SCENARIOS
+    )
+    async def test_complete_workflow_success(
+        self, data_override, sample_note, mock_conditions_data,
+        note, expected_age, expected_weight, expected_symptoms, severity, expected_dose
+    ):
         """Test the complete clinical decision support workflow."""
-        with patch('mcp_server.server.load_json_data', return_value=mock_conditions_data):
-            # Step 1: Parse clinical note
-            parsed_data = await parse_clinical_note(sample_clinical_note)
-            
-            assert parsed_data['success'] is True
-            assert parsed_data['patient_data']['age'] == 3
-            assert parsed_data['patient_data']['weight'] == 14.2
-            assert 'barky cough' in parsed_data['symptoms']
-            assert 'hoarse voice' in parsed_data['symptoms']
-            assert 'stridor' in parsed_data['symptoms']
-            
-            # Step 2: Identify condition
+        data_override[CONDITIONS_FILE] = mock_conditions_data
+        # Step 1: Parse clinical note
+        parsed_data = _parse_clinical_note_sync(sample_note if note is None else note)
+        
+        assert parsed_data['success'] is True
+        patient = parsed_data['patient_data']
+        age, weight = patient['age'], patient['weight']
+        assert age == expected_age
+        if expected_weight is not None:
+            assert weight == expected_weight
+        assert expected_symptoms.issubset(parsed_data['symptoms'])
+        
+        if expected_weight is None:
+            # Without a weight only condition identification is possible
             condition_result = await identify_condition(
-                parsed_data['symptoms'],
-                parsed_data['assessment'],
-                parsed_data['patient_data']['age']
+                parsed_data['symptoms'], parsed_data['assessment'], age
             )
             
             assert condition_result['success'] is True
-            assert len(condition_result['matches']) > 0
-            assert condition_result['matches'][0]['condition_id'] == 'croup'
-            
-            # Step 3: Calculate medication dose
-            dose_result = await calculate_medication_dose(
-                'dexamethasone', 'croup', parsed_data['patient_data']['weight']
-            )
-            
-            assert dose_result['success'] is True
-            assert dose_result['dose_calculation']['medication'] == 'dexamethasone'
-            assert dose_result['dose_calculation']['calculated_dose'] == 2.13  # 0.15 * 14.2
-            assert dose_result['dose_calculation']['final_dose'] == 2.13
-            assert dose_result['dose_calculation']['route'] == 'oral'
-            
-            # Step 4: Generate treatment plan
-            treatment_plan = await generate_treatment_plan(
-                'croup',
-                'moderate',
-                parsed_data,
-                [dose_result['dose_calculation']]
-            )
-            
-            assert treatment_plan['success'] is True
-            plan = treatment_plan['treatment_plan']
-            assert plan['condition'] == 'Croup (Laryngotracheobronchitis)'
-            assert plan['severity'] == 'moderate'
-            assert 'patient_summary' in plan
-            assert len(plan['medications']) > 0
-            assert plan['medications'][0]['medication'] == 'dexamethasone'
-            assert 'red_flags' in plan
-            assert 'clinical_pearls' in plan
+            matches = condition_result['matches']
+            assert len(matches) > 0
+            assert matches[0]['condition_id'] == 'croup'
+            return
+        
+        # Steps 2 and 3: Identify condition and calculate medication dose (independent)
+        condition_result, dose_result = await asyncio.gather(
+            identify_condition(parsed_data['symptoms'], parsed_data['assessment'], age),
+            calculate_medication_dose('dexamethasone', 'croup', weight)
+        )
+        
+        assert condition_result['success'] is True
+        matches = condition_result['matches']
+        assert len(matches) > 0
+        assert matches[0]['condition_id'] == 'croup'
+        
+        assert dose_result['success'] is True
+        dose = dose_result['dose_calculation']
+        assert dose['medication'] == 'dexamethasone'
+        assert dose['calculated_dose'] == expected_dose
+        assert dose['final_dose'] == expected_dose
+        assert dose['route'] == 'oral'
+        
+        # Step 4: Generate treatment plan
+        treatment_plan = await generate_treatment_plan(
+            'croup',
+            severity,
+            parsed_data,
+            [dose]
+        )
+        
+        assert treatment_plan['success'] is True
+        plan = treatment_plan['treatment_plan']
+        assert plan['condition'] == 'Croup (Laryngotracheobronchitis)'
+        assert plan['severity'] == severity
+        assert 'patient_summary' in plan
+        assert len(plan['medications']) > 0
+        assert plan['medications'][0]['medication'] == 'dexamethasone'
+        assert 'red_flags' in plan
+        assert 'clinical_pearls' in plan
     
     @pytest.mark.asyncio
-    async def test_workflow_with_missing_data_files(self, sample_clinical_note):
+    async def test_workflow_with_missing_data_files(self, missing_data_files, sample_note):
         """Test workflow graceful handling when data files are missing."""
-        from mcp_server.utils.error_handler import DataError, ErrorDetails
+        # Step 1: Parse clinical note (should still work)
+        parsed_data = await parse_clinical_note(sample_note)
+        assert parsed_data['success'] is True
         
-        with patch('mcp_server.server.load_json_data', side_effect=DataError(ErrorDetails(
-            code=ErrorCode.DATA_FILE_NOT_FOUND,
-            message="Data file not found",
-            details={},
-            recoverable=False
-        ))):
-            # Step 1: Parse clinical note (should still work)
-            parsed_data = await parse_clinical_note(sample_clinical_note)
-            assert parsed_data['success'] is True
-            
-            # Step 2: Identify condition (should fail gracefully)
-            condition_result = await identify_condition(
+        # Steps 2-4 only depend on the parsed note, so run them together
+        condition_result, dose_result, treatment_plan = await asyncio.gather(
+            identify_condition(
                 parsed_data['symptoms'],
                 parsed_data['assessment'],
                 parsed_data['patient_data']['age']
-            )
-            assert condition_result['success'] is False
-            assert condition_result['error']['code'] == ErrorCode.DATA_FILE_NOT_FOUND.value
-            
-            # Step 3: Calculate dose (should fail gracefully)
-            dose_result = await calculate_medication_dose('dexamethasone', 'croup', 14.2)
-            assert dose_result['success'] is False
-            assert dose_result['error']['code'] == ErrorCode.DATA_FILE_NOT_FOUND.value
-            
-            # Step 4: Generate treatment plan (should fail gracefully)
-            treatment_plan = await generate_treatment_plan('croup', 'moderate', parsed_data, [])
-            assert treatment_plan['success'] is False
-            assert treatment_plan['error']['code'] == ErrorCode.DATA_FILE_NOT_FOUND.value
-    
-    @pytest.mark.asyncio
-    async def test_workflow_with_alternative_clinical_note(self, mock_conditions_data):
-        """Test workflow with a different clinical scenario."""
-        alternative_note = """
-Patient: Emma S.
-Age: 2 years
-Weight: 12.5 kg
-
-Presenting complaint:
-Emma presented with a 1-day history of harsh barky cough and hoarse voice. 
-Mother reports the cough sounds like a seal bark. No fever reported.
-Child is eating and drinking normally.
-
-Assessment:
-Mild croup (laryngotracheobronchitis). No stridor at rest.
-
-Plan:
-- Supportive care
-- Consider corticosteroids if symptoms worsen
-"""
+            ),
+            calculate_medication_dose('dexamethasone', 'croup', 14.2),
+            generate_treatment_plan('croup', 'moderate', parsed_data, [])
+        )
         
-        with patch('mcp_server.server.load_json_data', return_value=mock_conditions_data):
-            # Parse clinical note
-            parsed_data = await parse_clinical_note(alternative_note)
-            
-            assert parsed_data['success'] is True
-            assert parsed_data['patient_data']['age'] == 2
-            assert parsed_data['patient_data']['weight'] == 12.5
-            assert 'barky cough' in parsed_data['symptoms']
-            assert 'hoarse voice' in parsed_data['symptoms']
-            
-            # Identify condition
-            condition_result = await identify_condition(
-                parsed_data['symptoms'],
-                parsed_data['assessment'],
-                parsed_data['patient_data']['age']
-            )
-            
-            assert condition_result['success'] is True
-            assert condition_result['matches'][0]['condition_id'] == 'croup'
-            
-            # Calculate dose for lighter patient
-            dose_result = await calculate_medication_dose(
-                'dexamethasone', 'croup', parsed_data['patient_data']['weight']
-            )
-            
-            assert dose_result['success'] is True
-            assert dose_result['dose_calculation']['calculated_dose'] == 1.875  # 0.15 * 12.5
-            assert dose_result['dose_calculation']['final_dose'] == 1.875
-            
-            # Generate treatment plan for mild severity
-            treatment_plan = await generate_treatment_plan(
-                'croup',
-                'mild',
-                parsed_data,
-                [dose_result['dose_calculation']]
-            )
-            
-            assert treatment_plan['success'] is True
-            assert treatment_plan['treatment_plan']['severity'] == 'mild'
+        # Step 2: Identify condition (should fail gracefully)
+        assert condition_result['success'] is False
+        assert condition_result['error']['code'] == ErrorCode.DATA_FILE_NOT_FOUND.value
+        
+        # Step 3: Calculate dose (should fail gracefully)
+        assert dose_result['success'] is False
+        assert dose_result['error']['code'] == ErrorCode.DATA_FILE_NOT_FOUND.value
+        
+        # Step 4: Generate treatment plan (should fail gracefully)
+        assert treatment_plan['success'] is False
+        assert treatment_plan['error']['code'] == ErrorCode.DATA_FILE_NOT_FOUND.value
     
     @pytest.mark.asyncio
-    async def test_workflow_error_propagation(self, sample_clinical_note, mock_conditions_data):
+    async def test_workflow_error_propagation(self, data_override, parsed_sample_note, mock_conditions_data):
         """Test that errors are properly propagated through the workflow."""
-        with patch('mcp_server.server.load_json_data', return_value=mock_conditions_data):
-            # Parse clinical note
-            parsed_data = await parse_clinical_note(sample_clinical_note)
-            assert parsed_data['success'] is True
-            
-            # Test invalid medication name
-            dose_result = await calculate_medication_dose(
-                'invalid_medication', 'croup', parsed_data['patient_data']['weight']
-            )
-            
-            assert dose_result['success'] is False
-            assert dose_result['error']['code'] == ErrorCode.MEDICATION_NOT_FOUND.value
-            
-            # Test invalid condition
-            condition_result = await identify_condition(
-                ['invalid_symptom'], 'invalid assessment', 3
-            )
-            
-            # Should still succeed but with no matches
-            assert condition_result['success'] is True
-            assert len(condition_result['matches']) == 0
-            
-            # Test treatment plan with invalid condition
-            treatment_plan = await generate_treatment_plan(
-                'invalid_condition', 'mild', parsed_data, []
-            )
-            
-            assert treatment_plan['success'] is False
-            assert treatment_plan['error']['code'] == ErrorCode.CONDITION_NOT_FOUND.value
-    
-    @pytest.mark.asyncio
-    async def test_workflow_with_minimal_clinical_note(self, mock_conditions_data):
-        """Test workflow with minimal clinical information."""
-        minimal_note = "3-year-old child with barky cough and hoarse voice."
+        data_override[CONDITIONS_FILE] = mock_conditions_data
+        # Parse clinical note
+        parsed_data = parsed_sample_note
+        assert parsed_data['success'] is True
         
-        with patch('mcp_server.server.load_json_data', return_value=mock_conditions_data):
-            # Parse minimal note
-            parsed_data = await parse_clinical_note(minimal_note)
-            
-            assert parsed_data['success'] is True
-            assert parsed_data['patient_data']['age'] == 3
-            assert 'barky cough' in parsed_data['symptoms']
-            assert 'hoarse voice' in parsed_data['symptoms']
-            
-            # Should still be able to identify condition
-            condition_result = await identify_condition(
-                parsed_data['symptoms'],
-                parsed_data['assessment'],
-                parsed_data['patient_data']['age']
-            )
-            
-            assert condition_result['success'] is True
-            assert len(condition_result['matches']) > 0
-            assert condition_result['matches'][0]['condition_id'] == 'croup'
+        # Test invalid medication name
+        dose_result = await calculate_medication_dose(
+            'invalid_medication', 'croup', parsed_data['patient_data']['weight']
+        )
+        
+        assert dose_result['success'] is False
+        assert dose_result['error']['code'] == ErrorCode.MEDICATION_NOT_FOUND.value
+        
+        # Test invalid condition
+        condition_result = await identify_condition(
+            ['invalid_symptom'], 'invalid assessment', 3
+        )
+        
+        # Should still succeed but with no matches
+        assert condition_result['success'] is True
+        assert len(condition_result['matches']) == 0
+        
+        # Test treatment plan with invalid condition
+        treatment_plan = await generate_treatment_plan(
+            'invalid_condition', 'mild', parsed_data, []
+        )
+        
+        assert treatment_plan['success'] is False
+        assert treatment_plan['error']['code'] == ErrorCode.CONDITION_NOT_FOUND.value
     
     @pytest.mark.asyncio
-    async def test_workflow_performance(self, sample_clinical_note, mock_conditions_data):
+    async def test_workflow_performance(self, data_override, sample_note, mock_conditions_data):
         """Test that the workflow completes in reasonable time."""
-        import time
+        # Install the mock data before timing so only the workflow is measured
+        data_override[CONDITIONS_FILE] = mock_conditions_data
+        start_time = perf_counter()
         
-        with patch('mcp_server.server.load_json_data', return_value=mock_conditions_data):
-            start_time = time.time()
-            
-            # Run complete workflow
-            parsed_data = await parse_clinical_note(sample_clinical_note)
-            condition_result = await identify_condition(
-                parsed_data['symptoms'],
-                parsed_data['assessment'],
-                parsed_data['patient_data']['age']
-            )
-            dose_result = await calculate_medication_dose(
-                'dexamethasone', 'croup', parsed_data['patient_data']['weight']
-            )
-            treatment_plan = await generate_treatment_plan(
-                'croup', 'moderate', parsed_data, [dose_result['dose_calculation']]
-            )
-            
-            end_time = time.time()
-            execution_time = end_time - start_time
-            
-            # Workflow should complete in under 1 second
-            assert execution_time < 1.0
-            
-            # All steps should succeed
-            assert parsed_data['success'] is True
-            assert condition_result['success'] is True
-            assert dose_result['success'] is True
-            assert treatment_plan['success'] is True
+        # Run complete workflow
+        parsed_data = await parse_clinical_note(sample_note)
+        patient = parsed_data['patient_data']
+        condition_result = await identify_condition(
+            parsed_data['symptoms'], parsed_data['assessment'], patient['age']
+        )
+        dose_result = await calculate_medication_dose('dexamethasone', 'croup', patient['weight'])
+        treatment_plan = await generate_treatment_plan(
+            'croup', 'moderate', parsed_data, [dose_result['dose_calculation']]
+        )
+        
+        execution_time = perf_counter() - start_time
+        
+        # Workflow should complete in under 1 second
+        assert execution_time < 1.0
+        
+        # All steps should succeed
+        assert parsed_data['success'] is True
+        assert condition_result['success'] is True
+        assert dose_result['success'] is True
+        assert treatment_plan['success'] is True
 
 
 if __name__ == '__main__':
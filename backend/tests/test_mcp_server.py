@@ -3,21 +3,16 @@ Tests for the MCP server basic functionality.
 """
 
 import pytest
-import json
 import asyncio
 from pathlib import Path
-from unittest.mock import patch, mock_open
-
-# Add the backend directory to the path
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from mcp_server.server import (
     parse_clinical_note,
     identify_condition,
     calculate_medication_dose,
     generate_treatment_plan,
-    load_json_data
+    load_json_data,
+    CONDITIONS_FILE
 )
 
 
@@ -49,8 +44,7 @@ class TestClinicalNoteParser:
         assert result['patient_data']['age'] == 3
         assert result['patient_data']['weight'] == 14.2
         assert result['patient_data']['dob'] == '12/03/2022'
-        assert 'barky cough' in result['symptoms']
-        assert 'hoarse voice' in result['symptoms']
+        assert {'barky cough', 'hoarse voice'}.issubset(result['symptoms'])
         assert 'moderate croup' in result['assessment'].lower()
     
     @pytest.mark.asyncio
@@ -62,8 +56,7 @@ class TestClinicalNoteParser:
         
         assert 'patient_data' in result
         assert 'symptoms' in result
-        assert 'cough' in result['symptoms']
-        assert 'fever' in result['symptoms']
+        assert {'cough', 'fever'} <= set(result['symptoms'])
     
     @pytest.mark.asyncio
     async def test_parse_clinical_note_empty(self):
@@ -79,15 +72,15 @@ class TestConditionIdentification:
     """Test condition identification functionality."""
     
     @pytest.mark.asyncio
-    async def test_identify_condition_no_data(self):
+    async def test_identify_condition_no_data(self, data_override):
         """Test condition identification when no data file exists."""
-        with patch('mcp_server.server.load_json_data', return_value={}):
-            result = await identify_condition(['barky cough'], 'croup', 3)
-            assert 'error' in result
-            assert 'not available' in result['error']
+        data_override[CONDITIONS_FILE] = {}
+        result = await identify_condition(['barky cough'], 'croup', 3)
+        assert 'error' in result
+        assert 'not available' in result['error']
     
     @pytest.mark.asyncio
-    async def test_identify_condition_with_data(self):
+    async def test_identify_condition_with_data(self, data_override):
         """Test condition identification with sample data."""
         mock_conditions = {
             'croup': {
@@ -99,28 +92,28 @@ class TestConditionIdentification:
             }
         }
         
-        with patch('mcp_server.server.load_json_data', return_value=mock_conditions):
-            result = await identify_condition(['barky cough', 'hoarse voice'], 'croup', 3)
-            
-            assert 'matches' in result
-            assert 'top_match' in result
-            assert len(result['matches']) > 0
-            assert result['top_match']['condition_id'] == 'croup'
+        data_override[CONDITIONS_FILE] = mock_conditions
+        result = await identify_condition(['barky cough', 'hoarse voice'], 'croup', 3)
+        
+        assert 'matches' in result
+        assert 'top_match' in result
+        assert len(result['matches']) > 0
+        assert result['top_match']['condition_id'] == 'croup'
 
 
 class TestDoseCalculation:
     """Test medication dose calculation."""
     
     @pytest.mark.asyncio
-    async def test_calculate_dose_no_data(self):
+    async def test_calculate_dose_no_data(self, data_override):
         """Test dose calculation when no data file exists."""
-        with patch('mcp_server.server.load_json_data', return_value={}):
-            result = await calculate_medication_dose('dexamethasone', 'croup', 14.2)
-            assert 'error' in result
-            assert 'not available' in result['error']
+        data_override[CONDITIONS_FILE] = {}
+        result = await calculate_medication_dose('dexamethasone', 'croup', 14.2)
+        assert 'error' in result
+        assert 'not available' in result['error']
     
     @pytest.mark.asyncio
-    async def test_calculate_dose_with_data(self):
+    async def test_calculate_dose_with_data(self, data_override):
         """Test dose calculation with sample data."""
         mock_conditions = {
             'croup': {
@@ -139,18 +132,18 @@ class TestDoseCalculation:
             }
         }
         
-        with patch('mcp_server.server.load_json_data', return_value=mock_conditions):
-            result = await calculate_medication_dose('dexamethasone', 'croup', 14.2)
-            
-            assert 'medication' in result
-            assert 'final_dose' in result
-            assert result['medication'] == 'dexamethasone'
-            assert result['final_dose'] == 2.13  # 0.15 * 14.2
-            assert result['route'] == 'oral'
-            assert result['frequency'] == 'single_dose'
+        data_override[CONDITIONS_FILE] = mock_conditions
+        result = await calculate_medication_dose('dexamethasone', 'croup', 14.2)
+        
+        assert 'medication' in result
+        assert 'final_dose' in result
+        assert result['medication'] == 'dexamethasone'
+        assert result['final_dose'] == 2.13  # 0.15 * 14.2
+        assert result['route'] == 'oral'
+        assert result['frequency'] == 'single_dose'
     
     @pytest.mark.asyncio
-    async def test_calculate_dose_with_limits(self):
+    async def test_calculate_dose_with_limits(self, data_override):
         """Test dose calculation with min/max limits."""
         mock_conditions = {
             'croup': {
@@ -169,26 +162,26 @@ class TestDoseCalculation:
             }
         }
         
-        with patch('mcp_server.server.load_json_data', return_value=mock_conditions):
-            result = await calculate_medication_dose('dexamethasone', 'croup', 14.2)
-            
-            assert result['calculated_dose'] == 2.13
-            assert result['final_dose'] == 2.0  # Limited by max_dose
+        data_override[CONDITIONS_FILE] = mock_conditions
+        result = await calculate_medication_dose('dexamethasone', 'croup', 14.2)
+        
+        assert result['calculated_dose'] == 2.13
+        assert result['final_dose'] == 2.0  # Limited by max_dose
 
 
 class TestTreatmentPlan:
     """Test treatment plan generation."""
     
     @pytest.mark.asyncio
-    async def test_generate_treatment_plan_no_data(self):
+    async def test_generate_treatment_plan_no_data(self, data_override):
         """Test treatment plan generation when no data exists."""
-        with patch('mcp_server.server.load_json_data', return_value={}):
-            result = await generate_treatment_plan('croup', 'moderate', {})
-            assert 'error' in result
-            assert 'not available' in result['error']
+        data_override[CONDITIONS_FILE] = {}
+        result = await generate_treatment_plan('croup', 'moderate', {})
+        assert 'error' in result
+        assert 'not available' in result['error']
     
     @pytest.mark.asyncio
-    async def test_generate_treatment_plan_with_data(self):
+    async def test_generate_treatment_plan_with_data(self, data_override):
         """Test treatment plan generation with sample data."""
         mock_conditions = {
             'croup': {
@@ -209,41 +202,40 @@ class TestTreatmentPlan:
             'route': 'oral'
         }]
         
-        with patch('mcp_server.server.load_json_data', return_value=mock_conditions):
-            result = await generate_treatment_plan('croup', 'moderate', patient_data, calculated_doses)
-            
-            assert 'condition' in result
-            assert 'severity' in result
-            assert 'patient_summary' in result
-            assert 'medications' in result
-            assert 'red_flags' in result
-            assert 'clinical_pearls' in result
-            assert result['condition'] == 'Croup (Laryngotracheobronchitis)'
-            assert result['severity'] == 'moderate'
-            assert result['medications'] == calculated_doses
+        data_override[CONDITIONS_FILE] = mock_conditions
+        result = await generate_treatment_plan('croup', 'moderate', patient_data, calculated_doses)
+        
+        assert 'condition' in result
+        assert 'severity' in result
+        assert 'patient_summary' in result
+        assert 'medications' in result
+        assert 'red_flags' in result
+        assert 'clinical_pearls' in result
+        assert result['condition'] == 'Croup (Laryngotracheobronchitis)'
+        assert result['severity'] == 'moderate'
+        assert result['medications'] == calculated_doses
 
 
 class TestDataLoading:
     """Test JSON data loading functionality."""
     
-    def test_load_json_data_success(self):
+    def test_load_json_data_success(self, patch_file_contents):
         """Test successful JSON data loading."""
         mock_data = {'test': 'data'}
-        mock_file_content = json.dumps(mock_data)
+        mock_file_content = '{"test": "data"}'
         
-        with patch('builtins.open', mock_open(read_data=mock_file_content)):
+        with patch_file_contents(mock_file_content):
             result = load_json_data(Path('test.json'))
             assert result == mock_data
     
-    def test_load_json_data_file_not_found(self):
+    def test_load_json_data_file_not_found(self, tmp_path):
         """Test handling of missing file."""
-        with patch('builtins.open', side_effect=FileNotFoundError):
-            result = load_json_data(Path('nonexistent.json'))
-            assert result == {}
+        result = load_json_data(tmp_path / "nonexistent.json")
+        assert result == {}
     
-    def test_load_json_data_invalid_json(self):
+    def test_load_json_data_invalid_json(self, patch_file_contents):
         """Test handling of invalid JSON."""
-        with patch('builtins.open', mock_open(read_data='invalid json')):
+        with patch_file_contents('invalid json'):
             result = load_json_data(Path('invalid.json'))
             assert result == {}
 
@@ -1,35 +1,38 @@
 #!/usr/bin/env python3
 
 import pytest
-import asyncio
-from mcp_server.tools.parser import ClinicalNoteParser, parse_clinical_note
+from mcp_server.tools.parser import (
+    ClinicalNoteParser, parse_clinical_note, clear_parse_cache, _parse_cached, _parse_clinical_note_sync
+)
+from mcp_server.utils.text import normalize_text
 from mcp_server.schemas.patient import PatientData, ClinicalNote, ParsedClinicalNote
 
-class TestClinicalNoteParser:
-    """Test cases for clinical note parsing."""
+# Symptoms the parser must extract from the shared sample note
+EXPECTED_SYMPTOMS = frozenset({"barky cough", "hoarse voice", "stridor", "fever", "work of breathing", "cough"})
 
-    @pytest.fixture
-    def parser(self):
-        return ClinicalNoteParser()
+AGE_FORMAT_CASES = (
+    ("Patient is 25 years old", 25),
+    ("Age: 30 years", 30),
+    ("45 yo male", 45),
+    ("Age 60", 60),
+    ("The patient is 5 years old", 5),
+)
 
-    @pytest.fixture
-    def sample_note(self):
-        return """
-Patient: Jack T.
-DOB: 12/03/2022
-Age: 3 years
-Weight: 14.2 kg
+WEIGHT_FORMAT_CASES = (
+    ("Weight: 75.5 kg", 75.5),
+    ("Patient weighs 80 kg", 80.0),
+    ("Wt: 65.2 kg", 65.2),
+    ("Body weight is 70kg", 70.0),
+)
 
-Presenting complaint:
-Jack presented with a 2-day history of barky cough, hoarse voice, and low-grade fever. Symptoms worsened overnight, with increased work of breathing and stridor noted at rest this morning.
 
-Assessment:
-Jack presents with classic features of moderate croup (laryngotracheobronchitis), likely viral in origin.
+class TestClinicalNoteParser:
+    """Test cases for clinical note parsing."""
 
-Plan:
-- Administer corticosteroids
-- Plan as per local guidelines for croup
-"""
+    @pytest.fixture(scope="module")
+    def parser(self):
+        # Stateless between parses, so one instance serves the whole module
+        return ClinicalNoteParser()
 
     def test_extract_demographics(self, parser, sample_note):
         """Test demographic extraction."""
@@ -45,10 +48,8 @@ Plan:
         """Test symptom extraction."""
         symptoms = parser.extract_symptoms(sample_note)
         
-        expected_symptoms = ["barky cough", "hoarse voice", "stridor", "fever", "work of breathing", "cough"]
-        assert len(symptoms) == len(expected_symptoms)
-        for symptom in expected_symptoms:
-            assert symptom in symptoms
+        assert len(symptoms) == len(EXPECTED_SYMPTOMS)
+        assert set(symptoms) == EXPECTED_SYMPTOMS
 
     def test_extract_vital_signs(self, parser):
         """Test vital signs extraction."""
@@ -94,8 +95,7 @@ O2 sat: 98%
         assert result.data.patient_data.weight == 14.2
         
         # Test symptoms
-        assert "barky cough" in result.data.symptoms
-        assert "stridor" in result.data.symptoms
+        assert {"barky cough", "stridor"} <= set(result.data.symptoms)
         
         # Test assessment
         assert "moderate croup" in result.data.assessment
@@ -120,10 +120,9 @@ O2 sat: 98%
         assert result.data.patient_data.age is None
         assert len(result.data.symptoms) == 0
 
-    @pytest.mark.asyncio
-    async def test_convenience_function(self, sample_note):
+    def test_convenience_function(self, parsed_sample_note):
         """Test the convenience function."""
-        result = await parse_clinical_note(sample_note)
+        result = parsed_sample_note
         
         assert "patient_data" in result
         assert "symptoms" in result
@@ -134,6 +133,31 @@ O2 sat: 98%
         assert result["patient_data"]["weight"] == 14.2
         assert "barky cough" in result["symptoms"]
 
+    def test_convenience_function_normalizes_unicode(self):
+        """Test decomposed characters are NFC-normalized before parsing."""
+        note = "Assessment: Fie\u0300vre chez Franc\u0327ois, viral croup"
+        result = _parse_clinical_note_sync(note)
+
+        assert result["assessment"] == "Fi\u00e8vre chez Fran\u00e7ois, viral croup"
+
+    @pytest.mark.asyncio
+    async def test_convenience_function_memoizes_parse(self, sample_note):
+        """Test the async wrapper reuses the cached parse but returns independent results."""
+        clear_parse_cache()
+        first = await parse_clinical_note(sample_note)
+        first["symptoms"].append("mutated")
+        second = await parse_clinical_note(sample_note)
+
+        assert _parse_cached.cache_info().hits == 1
+        assert "mutated" not in second["symptoms"]
+        assert second["patient_data"] == first["patient_data"]
+
+    def test_normalize_text_quick_check(self):
+        """Test already-NFC text is returned unchanged and decomposed text is composed."""
+        composed = "Fran\u00e7ois M\u00fcller"
+        assert normalize_text(composed) is composed
+        assert normalize_text("Franc\u0327ois Mu\u0308ller") == composed
+
     def test_age_validation(self):
         """Test age validation."""
         # Valid age
@@ -160,29 +184,12 @@ O2 sat: 98%
         with pytest.raises(ValueError, match="Weight must be between 0.5 and 500 kg"):
             PatientData(weight=0.1)
 
-    def test_various_age_formats(self, parser):
+    @pytest.mark.parametrize("note,expected_age", AGE_FORMAT_CASES)
+    def test_various_age_formats(self, parser, note, expected_age):
         """Test different age format patterns."""
-        test_cases = [
-            ("Patient is 25 years old", 25),
-            ("Age: 30 years", 30),
-            ("45 yo male", 45),
-            ("Age 60", 60),
-            ("The patient is 5 years old", 5),
-        ]
-        
-        for note, expected_age in test_cases:
-            demographics = parser.extract_demographics(note)
-            assert demographics.age == expected_age
-
-    def test_various_weight_formats(self, parser):
+        assert parser.extract_demographics(note).age == expected_age
+
+    @pytest.mark.parametrize("note,expected_weight", WEIGHT_FORMAT_CASES)
+    def test_various_weight_formats(self, parser, note, expected_weight):
         """Test different weight format patterns."""
-        test_cases = [
-            ("Weight: 75.5 kg", 75.5),
-            ("Patient weighs 80 kg", 80.0),
-            ("Wt: 65.2 kg", 65.2),
-            ("Body weight is 70kg", 70.0),
-        ]
-        
-        for note, expected_weight in test_cases:
-            demographics = parser.extract_demographics(note)
-            assert demographics.weight == expected_weight
\ No newline at end of file
+        assert parser.extract_demographics(note).weight == expected_weight
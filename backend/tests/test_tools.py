@@ -4,26 +4,21 @@ Comprehensive unit tests for all MCP tools.
 """
 
 import pytest
-import json
 import asyncio
 from pathlib import Path
-from unittest.mock import patch, mock_open, MagicMock
-import sys
-
-# Add the backend directory to the path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from mcp_server.tools.parser import ClinicalNoteParser, parse_clinical_note
 from mcp_server.tools.treatment_planner import TreatmentPlanGenerator
+from mcp_server.server import identify_condition, calculate_medication_dose, CONDITIONS_FILE
 from mcp_server.schemas.patient import PatientData, ClinicalNote, ParsedClinicalNote, VitalSigns
 
 
 class TestClinicalNoteParser:
     """Test clinical note parsing functionality."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def parser(self):
-        """Create a parser instance for testing."""
+        """Create a parser instance shared by the module's tests."""
         return ClinicalNoteParser()
     
     @pytest.fixture
@@ -77,8 +72,7 @@ Plan:
         expected_symptoms = ["barky cough", "hoarse voice", "stridor", "fever", "work of breathing", "cough"]
         assert len(symptoms) >= 5
         
-        for symptom in ["barky cough", "hoarse voice", "stridor"]:
-            assert symptom in symptoms
+        assert {"barky cough", "hoarse voice", "stridor"} <= set(symptoms)
     
     def test_extract_vital_signs_complete(self, parser):
         """Test vital signs extraction with complete vitals."""
@@ -144,8 +138,7 @@ O2 sat: 98% on room air
         assert result.data.patient_data.weight == 14.2
         
         # Test symptoms
-        assert "barky cough" in result.data.symptoms
-        assert "stridor" in result.data.symptoms
+        assert {"barky cough", "stridor"} <= set(result.data.symptoms)
         
         # Test assessment
         assert "moderate croup" in result.data.assessment
@@ -158,8 +151,7 @@ O2 sat: 98% on room air
         
         assert result.success is True
         assert result.data is not None
-        assert "cough" in result.data.symptoms
-        assert "fever" in result.data.symptoms
+        assert {"cough", "fever"} <= set(result.data.symptoms)
     
     def test_parse_empty_note(self, parser):
         """Test parsing of empty note."""
@@ -201,102 +193,104 @@ O2 sat: 98% on room air
             PatientData(weight=0.1)
 
 
-class TestTreatmentPlanGenerator:
-    """Test treatment plan generation functionality."""
-    
-    @pytest.fixture
-    def mock_conditions_data(self):
-        """Mock conditions data for testing."""
-        return {
-            'croup': {
-                'name': 'Croup (Laryngotracheobronchitis)',
-                'description': 'Viral infection of the larynx and trachea',
-                'icd_codes': ['J05.0'],
-                'age_groups': ['pediatric'],
-                'symptoms': {
-                    'primary': ['barky cough', 'hoarse voice', 'stridor'],
-                    'secondary': ['fever', 'rhinitis', 'pharyngitis']
-                },
-                'severity_scales': {
-                    'mild': 'Occasional barky cough, no stridor at rest',
-                    'moderate': 'Frequent barky cough, stridor at rest, mild respiratory distress',
-                    'severe': 'Continuous barky cough, stridor at rest, significant respiratory distress'
-                },
-                'medications': {
-                    'first_line': {
-                        'dexamethasone': {
-                            'dose_mg_per_kg': 0.15,
-                            'max_dose_mg': 10.0,
-                            'min_dose_mg': 0.6,
-                            'route': 'oral',
-                            'frequency': 'single_dose',
-                            'duration': '1 day',
-                            'age_restrictions': 'All ages',
-                            'contraindications': ['known hypersensitivity']
-                        },
-                        'prednisolone': {
-                            'dose_mg_per_kg': 1.0,
-                            'max_dose_mg': 40.0,
-                            'min_dose_mg': 5.0,
-                            'route': 'oral',
-                            'frequency': 'daily',
-                            'duration': '3-5 days',
-                            'age_restrictions': 'All ages',
-                            'contraindications': ['systemic fungal infections']
-                        }
+@pytest.fixture
+def mock_conditions_data():
+    """Mock conditions data for testing."""
+    return {
+        'croup': {
+            'name': 'Croup (Laryngotracheobronchitis)',
+            'description': 'Viral infection of the larynx and trachea',
+            'icd_codes': ['J05.0'],
+            'age_groups': ['pediatric'],
+            'symptoms': {
+                'primary': ['barky cough', 'hoarse voice', 'stridor'],
+                'secondary': ['fever', 'rhinitis', 'pharyngitis']
+            },
+            'severity_scales': {
+                'mild': 'Occasional barky cough, no stridor at rest',
+                'moderate': 'Frequent barky cough, stridor at rest, mild respiratory distress',
+                'severe': 'Continuous barky cough, stridor at rest, significant respiratory distress'
+            },
+            'medications': {
+                'first_line': {
+                    'dexamethasone': {
+                        'dose_mg_per_kg': 0.15,
+                        'max_dose_mg': 10.0,
+                        'min_dose_mg': 0.6,
+                        'route': 'oral',
+                        'frequency': 'single_dose',
+                        'duration': '1 day',
+                        'age_restrictions': 'All ages',
+                        'contraindications': ['known hypersensitivity']
                     },
-                    'second_line': {
-                        'budesonide': {
-                            'dose_mg_per_kg': None,
-                            'max_dose_mg': 2.0,
-                            'min_dose_mg': 2.0,
-                            'route': 'nebulized',
-                            'frequency': 'single_dose',
-                            'duration': '1 day',
-                            'age_restrictions': 'All ages',
-                            'contraindications': []
-                        }
+                    'prednisolone': {
+                        'dose_mg_per_kg': 1.0,
+                        'max_dose_mg': 40.0,
+                        'min_dose_mg': 5.0,
+                        'route': 'oral',
+                        'frequency': 'daily',
+                        'duration': '3-5 days',
+                        'age_restrictions': 'All ages',
+                        'contraindications': ['systemic fungal infections']
                     }
                 },
-                'clinical_pearls': [
-                    'Most cases are viral in origin',
-                    'Peak incidence in autumn',
-                    'Supportive care is often sufficient'
-                ],
-                'red_flags': [
-                    'cyanosis',
-                    'drooling',
-                    'inability to swallow',
-                    'toxic appearance'
-                ]
-            }
-        }
-    
-    @pytest.fixture
-    def mock_guidelines_data(self):
-        """Mock guidelines data for testing."""
-        return {
-            'pediatric_croup_2023': {
-                'name': 'Pediatric Croup Management Guidelines 2023',
-                'version': '1.0',
-                'last_updated': '2023-01-01',
-                'source': 'Pediatric Emergency Medicine Society',
-                'conditions': ['croup'],
-                'decision_tree': {
-                    'assessment': {
-                        'severity_assessment': 'Use clinical scoring system',
-                        'age_considerations': 'Most common in 6 months to 6 years'
-                    },
-                    'treatment_algorithm': {
-                        'mild': 'Supportive care, consider corticosteroids',
-                        'moderate': 'Corticosteroids (dexamethasone or prednisolone)',
-                        'severe': 'Corticosteroids + nebulized epinephrine + hospital admission'
+                'second_line': {
+                    'budesonide': {
+                        'dose_mg_per_kg': None,
+                        'max_dose_mg': 2.0,
+                        'min_dose_mg': 2.0,
+                        'route': 'nebulized',
+                        'frequency': 'single_dose',
+                        'duration': '1 day',
+                        'age_restrictions': 'All ages',
+                        'contraindications': []
                     }
+                }
+            },
+            'clinical_pearls': [
+                'Most cases are viral in origin',
+                'Peak incidence in autumn',
+                'Supportive care is often sufficient'
+            ],
+            'red_flags': [
+                'cyanosis',
+                'drooling',
+                'inability to swallow',
+                'toxic appearance'
+            ]
+        }
+    }
+
+
+@pytest.fixture
+def mock_guidelines_data():
+    """Mock guidelines data for testing."""
+    return {
+        'pediatric_croup_2023': {
+            'name': 'Pediatric Croup Management Guidelines 2023',
+            'version': '1.0',
+            'last_updated': '2023-01-01',
+            'source': 'Pediatric Emergency Medicine Society',
+            'conditions': ['croup'],
+            'decision_tree': {
+                'assessment': {
+                    'severity_assessment': 'Use clinical scoring system',
+                    'age_considerations': 'Most common in 6 months to 6 years'
                 },
-                'monitoring': 'Monitor respiratory status, oxygen saturation',
-                'follow_up': 'Return if symptoms worsen or fail to improve in 24-48 hours'
-            }
+                'treatment_algorithm': {
+                    'mild': 'Supportive care, consider corticosteroids',
+                    'moderate': 'Corticosteroids (dexamethasone or prednisolone)',
+                    'severe': 'Corticosteroids + nebulized epinephrine + hospital admission'
+                }
+            },
+            'monitoring': 'Monitor respiratory status, oxygen saturation',
+            'follow_up': 'Return if symptoms worsen or fail to improve in 24-48 hours'
         }
+    }
+
+
+class TestTreatmentPlanGenerator:
+    """Test treatment plan generation functionality."""
     
     @pytest.fixture
     def treatment_planner(self, mock_conditions_data, mock_guidelines_data):
@@ -306,27 +300,26 @@ class TestTreatmentPlanGenerator:
         planner.guidelines = mock_guidelines_data
         return planner
     
-    def test_load_json_data_success(self):
+    def test_load_json_data_success(self, patch_file_contents):
         """Test successful JSON data loading."""
         mock_data = {'test': 'data'}
-        mock_file_content = json.dumps(mock_data)
+        mock_file_content = '{"test": "data"}'
         
         planner = TreatmentPlanGenerator()
-        with patch('builtins.open', mock_open(read_data=mock_file_content)):
+        with patch_file_contents(mock_file_content, 'mcp_server.tools.treatment_planner'):
             result = planner._load_json_data(Path('test.json'))
             assert result == mock_data
     
-    def test_load_json_data_file_not_found(self):
+    def test_load_json_data_file_not_found(self, tmp_path):
         """Test handling of missing file."""
         planner = TreatmentPlanGenerator()
-        with patch('builtins.open', side_effect=FileNotFoundError):
-            result = planner._load_json_data(Path('nonexistent.json'))
-            assert result == {}
+        result = planner._load_json_data(tmp_path / "nonexistent.json")
+        assert result == {}
     
-    def test_load_json_data_invalid_json(self):
+    def test_load_json_data_invalid_json(self, patch_file_contents):
         """Test handling of invalid JSON."""
         planner = TreatmentPlanGenerator()
-        with patch('builtins.open', mock_open(read_data='invalid json')):
+        with patch_file_contents('invalid json', 'mcp_server.tools.treatment_planner'):
             result = planner._load_json_data(Path('invalid.json'))
             assert result == {}
     
@@ -343,6 +336,17 @@ class TestTreatmentPlanGenerator:
         guideline = treatment_planner.get_guideline_for_condition('nonexistent')
         assert guideline is None
     
+    def test_comprehensive_plans_are_independent(self):
+        """Test that editing a plan does not change plans from later planners."""
+        patient_data = {'patient_data': {'age': 3, 'weight': 14.2}, 'symptoms': ['barky cough']}
+        first = TreatmentPlanGenerator().generate_comprehensive_plan('croup', 'moderate', patient_data)
+        first['red_flags'].append('edited')
+        first['clinical_pearls'].clear()
+        
+        second = TreatmentPlanGenerator().generate_comprehensive_plan('croup', 'moderate', patient_data)
+        assert 'edited' not in second['red_flags']
+        assert len(second['clinical_pearls']) > 0
+    
     def test_calculate_medication_dose_valid(self, treatment_planner):
         """Test medication dose calculation with valid inputs."""
         dose_info = treatment_planner.calculate_medication_dose(
@@ -489,8 +493,12 @@ Plan:
         }
     
     @pytest.mark.asyncio
-    async def test_full_workflow_integration(self, sample_clinical_data):
+    async def test_full_workflow_integration(
+        self, sample_clinical_data, data_override, mock_conditions_data
+    ):
         """Test the complete workflow from note parsing to treatment plan."""
+        data_override[CONDITIONS_FILE] = mock_conditions_data
+        
         # Step 1: Parse clinical note
         parsed_data = await parse_clinical_note(sample_clinical_data['note'])
         
@@ -500,69 +508,38 @@ Plan:
         assert 'barky cough' in parsed_data['symptoms']
         assert 'hoarse voice' in parsed_data['symptoms']
         
-        # Step 2: Mock treatment planner for integration test
-        with patch('mcp_server.tools.treatment_planner.TreatmentPlanGenerator') as mock_planner:
-            mock_instance = MagicMock()
-            mock_planner.return_value = mock_instance
-            
-            # Mock condition identification
-            mock_instance.identify_condition_by_symptoms.return_value = [{
-                'condition_id': 'croup',
-                'match_score': 0.85,
-                'matched_symptoms': ['barky cough', 'hoarse voice']
-            }]
-            
-            # Mock dose calculation
-            mock_instance.calculate_medication_dose.return_value = {
-                'medication': 'dexamethasone',
-                'calculated_dose': 1.875,  # 0.15 * 12.5
-                'final_dose': 1.875,
-                'route': 'oral',
-                'frequency': 'single_dose'
-            }
-            
-            # Mock treatment plan generation
-            mock_instance.generate_treatment_plan.return_value = {
-                'condition': 'Croup (Laryngotracheobronchitis)',
-                'severity': 'mild',
-                'patient_summary': 'Emma S., 2 years old, 12.5 kg',
-                'medications': [{
-                    'medication': 'dexamethasone',
-                    'final_dose': 1.875,
-                    'route': 'oral'
-                }],
-                'red_flags': ['cyanosis', 'drooling'],
-                'clinical_pearls': ['Most cases are viral']
-            }
-            
-            # Test that the integration would work
-            planner = mock_planner()
-            
-            # Step 3: Identify condition
-            condition_matches = planner.identify_condition_by_symptoms(
-                parsed_data['symptoms'], 
-                age=parsed_data['patient_data']['age']
-            )
-            
-            assert len(condition_matches) > 0
-            assert condition_matches[0]['condition_id'] == 'croup'
-            
-            # Step 4: Calculate doses
-            dose_info = planner.calculate_medication_dose(
-                'dexamethasone', 'croup', parsed_data['patient_data']['weight']
-            )
-            
-            assert dose_info['medication'] == 'dexamethasone'
-            assert dose_info['final_dose'] == 1.875
-            
-            # Step 5: Generate treatment plan
-            treatment_plan = planner.generate_treatment_plan(
-                'croup', 'mild', parsed_data
-            )
-            
-            assert treatment_plan['condition'] == 'Croup (Laryngotracheobronchitis)'
-            assert treatment_plan['severity'] == 'mild'
-            assert len(treatment_plan['medications']) > 0
+        # Step 2: Identify condition with the real server tool
+        condition_result = await identify_condition(
+            parsed_data['symptoms'],
+            parsed_data['assessment'],
+            parsed_data['patient_data']['age']
+        )
+        
+        assert condition_result['success'] is True
+        assert len(condition_result['matches']) > 0
+        assert condition_result['matches'][0]['condition_id'] == sample_clinical_data['expected_condition']
+        
+        # Step 3: Calculate doses
+        dose_info = await calculate_medication_dose(
+            'dexamethasone', 'croup', parsed_data['patient_data']['weight']
+        )
+        
+        assert dose_info['success'] is True
+        assert dose_info['medication'] == 'dexamethasone'
+        assert dose_info['final_dose'] == pytest.approx(1.875)  # 0.15 * 12.5
+        
+        # Step 4: Generate treatment plan with a real planner on the same conditions data
+        planner = TreatmentPlanGenerator()
+        planner.conditions = mock_conditions_data
+        treatment_plan = planner.generate_comprehensive_plan(
+            'croup', sample_clinical_data['expected_severity'], parsed_data, [dose_info]
+        )
+        
+        assert treatment_plan['condition'] == 'Croup (Laryngotracheobronchitis)'
+        assert treatment_plan['severity'] == 'mild'
+        assert treatment_plan['medications'][0]['medication'] == 'dexamethasone'
+        assert treatment_plan['red_flags'] == mock_conditions_data['croup']['red_flags']
+        assert 'guideline_info' in treatment_plan
 
 
 if __name__ == '__main__':
@@ -5,15 +5,14 @@ Demonstrates complete clinical workflow: parse → identify → dose → plan
 """
 
 import asyncio
-import json
+import orjson
 import sys
+from pathlib import Path
+from typing import List, Tuple
 from backend.mcp_server.server import parse_clinical_note, identify_condition, calculate_medication_dose, generate_treatment_plan
 
-async def main():
-    """Minimal demo of complete clinical decision support workflow."""
-    
-    # Sample clinical note (Jack T. croup case from CLAUDE.md)
-    clinical_note = """
+# Sample clinical note (Jack T. croup case from CLAUDE.md)
+SAMPLE_NOTE = """
     Patient: Jack T.
     DOB: 12/03/2022
     Age: 3 years
@@ -26,31 +25,67 @@ async def main():
     Assessment:
     Jack presents with classic features of moderate croup (laryngotracheobronchitis), likely viral in origin.
     """
+
+
+def _error_line(step: str, result: dict) -> Tuple[str, str]:
+    """Format a tool error response as an output line."""
+    error = result['error']
+    return ("❌ ERROR:", f"{step}: {error['code']} - {error['message']}")
+
+
+async def run_workflow(clinical_note: str) -> List[Tuple[str, str]]:
+    """Run parse → identify → dose → plan for one note and return the lines to print."""
+    # Step 1: Parse clinical note
+    parsed = await parse_clinical_note(clinical_note)
+    if parsed.get('success') is False:
+        return [_error_line("Parse", parsed)]
+    output = [("✅ PARSED:", orjson.dumps(parsed, option=orjson.OPT_INDENT_2).decode())]
+    
+    # Step 2: Identify condition
+    age = parsed['patient_data']['age']
+    condition_result = await identify_condition(parsed['symptoms'], parsed['assessment'], age)
+    if condition_result.get('success') is False:
+        output.append(_error_line("Identify condition", condition_result))
+        return output
+    if condition_result['top_match'] is None:
+        output.append(("❌ ERROR:", "Identify condition: no matching condition"))
+        return output
+    condition = condition_result['top_match']['condition_id']
+    output.append(("✅ CONDITION:", condition))
+    
+    # Step 3: Calculate medication dose
+    weight = parsed['patient_data']['weight']
+    if weight is None:
+        output.append(("❌ ERROR:", "Calculate dose: no patient weight in the note"))
+        return output
+    dose_result = await calculate_medication_dose('dexamethasone', condition, weight, 'moderate')
+    if dose_result.get('success') is False:
+        output.append(_error_line("Calculate dose", dose_result))
+        return output
+    output.append(("✅ DOSE:", f"{dose_result['final_dose']}mg {dose_result['medication']}"))
+    
+    # Step 4: Generate treatment plan
+    treatment_plan = await generate_treatment_plan(condition, 'moderate', parsed, [dose_result])
+    if treatment_plan.get('success') is False:
+        output.append(_error_line("Treatment plan", treatment_plan))
+        return output
+    output.append(("✅ TREATMENT PLAN:", orjson.dumps(treatment_plan, option=orjson.OPT_INDENT_2).decode()))
+    return output
+
+
+async def main(notes: List[str]) -> None:
+    """Minimal demo of complete clinical decision support workflow."""
+    # Notes are independent, so run their workflows concurrently and report in input order
+    results = await asyncio.gather(*(run_workflow(note) for note in notes), return_exceptions=True)
     
-    try:
-        # Step 1: Parse clinical note
-        parsed = await parse_clinical_note(clinical_note)
-        print("✅ PARSED:", json.dumps(parsed, indent=2))
-        
-        # Step 2: Identify condition
-        symptoms = parsed['patient_data']['symptoms']
-        assessment = parsed['patient_data']['assessment']
-        age = parsed['patient_data']['age']
-        condition_result = await identify_condition(symptoms, assessment, age)
-        condition = condition_result['top_match']['condition_id']
-        print("✅ CONDITION:", condition)
-        
-        # Step 3: Calculate medication dose
-        weight = parsed['patient_data']['weight']
-        dose_result = await calculate_medication_dose('dexamethasone', condition, weight, 'moderate')
-        print("✅ DOSE:", f"{dose_result['final_dose']}mg {dose_result['medication']}")
-        
-        # Step 4: Generate treatment plan
-        treatment_plan = await generate_treatment_plan(condition, 'moderate', parsed['patient_data'], [dose_result])
-        print("✅ TREATMENT PLAN:", json.dumps(treatment_plan, indent=2))
-        
-    except Exception as e:
-        print("❌ ERROR:", str(e))
+    for result in results:
+        if isinstance(result, Exception):
+            print("❌ ERROR:", str(result))
+            continue
+        for label, text in result:
+            print(label, text)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Note files from the command line, or the built-in sample note
+    notes = [Path(path).read_text() for path in sys.argv[1:]] or [SAMPLE_NOTE]
+    asyncio.run(main(notes))